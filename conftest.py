@@ -1,15 +1,87 @@
 # conftest.py
+import functools
 import os
 import json
 import logging
+from collections import Counter
 import pytest
 
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from webdriver_manager.chrome import ChromeDriverManager
-
-from logger_utils import setup_loggers
+from logger_utils import get_result_logger, setup_loggers
+from utils.command_audit import get_command_audit
+from utils.driver_pool import DriverPool
+from utils.flow_profiler import FlowSampler, write_collapsed
+from utils.step_metrics import get_step_metrics
+from utils.tracing import get_tracer, trace_file_name
+from utils.warm_spawner import WarmSpawner
+from utils.browser_profiles import PROFILES, PROFILE_ENV, launch_chrome, profile_name
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--pool-size", action="store", type=int,
+        default=int(os.environ.get("LEDGER_POOL_SIZE", "1")),
+        help="Number of warm browser sessions kept alive for the session (env: LEDGER_POOL_SIZE).",
+    )
+    parser.addoption(
+        "--browser-profile", action="store", default=None, choices=sorted(PROFILES),
+        help=f"Chrome launch profile (env: {PROFILE_ENV}; default: debug).",
+    )
+    parser.addoption(
+        "--batch-file", action="store", default=os.environ.get("LEDGER_BATCH_FILE"),
+        help="CSV/JSONL/text file of tickets for tests/test_batch.py (env: LEDGER_BATCH_FILE).",
+    )
+    parser.addoption(
+        "--batch-flow", action="store", default="payment", choices=["payment", "adjustment"],
+        help="Flow applied to every ticket of --batch-file.",
+    )
+    parser.addoption(
+        "--batch-tabs", action="store", type=int, default=1,
+        help="Interleave batch tickets across this many tabs of one browser.",
+    )
+    parser.addoption(
+        "--warm-sessions", action="store", type=int,
+        default=int(os.environ.get("LEDGER_WARM_SESSIONS", "0")),
+        help="Idle pre-launched browsers kept ready in the background (env: LEDGER_WARM_SESSIONS; 0 = off).",
+    )
+    parser.addoption(
+        "--warm-login", action="store_true", default=False,
+        help="Log warm browsers into the first client of data/ledger_client_data.json before handing them out.",
+    )
+    parser.addoption(
+        "--trace-spans", action="store_true", default=False,
+        help="Record nested step/helper/WebDriver spans; one Chrome trace JSON per test in logs/traces/.",
+    )
+    parser.addoption(
+        "--profile-flows", action="store_true", default=False,
+        help="Sample Python stacks during each test; collapsed stacks per test and merged in logs/profiles/.",
+    )
+    parser.addoption(
+        "--profile-interval", action="store", type=float, default=5.0,
+        help="Sampling interval in milliseconds for --profile-flows.",
+    )
+
+
+def pytest_terminal_summary(terminalreporter):
+    """Per-step latency percentiles and chatty-step flags from log_step (tables on screen, JSON in logs/)."""
+    metrics = get_step_metrics()
+    if not len(metrics):
+        return
+    rows = metrics.write_report(os.path.join("logs", "step_metrics.json"))
+    terminalreporter.section("step latency")
+    terminalreporter.write_line(metrics.table(rows))
+    terminalreporter.write_line("JSON: logs/step_metrics.json")
+
+    audit = get_command_audit()
+    flagged = audit.flagged(audit.write_report(os.path.join("logs", "command_audit.json")))
+    if flagged:
+        terminalreporter.section("chatty steps")
+        for row in flagged:
+            repeated = ", ".join(f"{n}x {key}" for key, n in row["repeated"].items())
+            terminalreporter.write_line(
+                f"{row['step']}: avg {row['avg_commands']} / max {row['max_commands']} round-trips "
+                f"(budget {audit.budget}), over budget {row['over_budget']}x"
+                + (f"; repeated finds: {repeated}" if repeated else ""))
+        terminalreporter.write_line("JSON: logs/command_audit.json")
 
 
 @pytest.fixture(scope="session", autouse=True)
@@ -49,6 +121,45 @@ def _configure_logging():
     yield
 
 
+@pytest.fixture(autouse=True)
+def _trace_spans(request):
+    """With --trace-spans: the test is the root span, exported for Perfetto / chrome://tracing."""
+    if not request.config.getoption("--trace-spans"):
+        yield
+        return
+    tracer = get_tracer()
+    tracer.enable()
+    tracer.clear()
+    with tracer.span(request.node.nodeid, "test"):
+        yield
+    tracer.export(os.path.join("logs", "traces", trace_file_name(request.node.nodeid)), clear=True)
+
+
+@pytest.fixture(scope="session")
+def _flow_profile_merged():
+    merged = Counter()
+    yield merged
+    if merged:
+        write_collapsed(os.path.join("logs", "profiles", "merged.collapsed"), merged)
+
+
+@pytest.fixture(autouse=True)
+def _profile_flows(request):
+    """With --profile-flows: statistical stack samples for this test, rooted at the active log_step."""
+    if not request.config.getoption("--profile-flows"):
+        yield
+        return
+    merged = request.getfixturevalue("_flow_profile_merged")
+    sampler = FlowSampler(request.config.getoption("--profile-interval") / 1000.0).start()
+    yield
+    stacks = sampler.stop()
+    name = trace_file_name(request.node.nodeid).replace(".trace.json", ".collapsed")
+    write_collapsed(os.path.join("logs", "profiles", name), stacks)
+    merged.update(stacks)
+    get_result_logger().info("[DEBUG] Profile %s: %d samples, by step %s",
+                             request.node.name, sampler.samples, sampler.by_step())
+
+
 @pytest.fixture(scope="session")
 def clients_data():
     """Load clients from data/ledger_client_data.json"""
@@ -58,24 +169,36 @@ def clients_data():
     return data["clients"]
 
 
-@pytest.fixture(scope="function")
-def driver():
-    """Visible Chrome (no headless), auto-driver via webdriver-manager."""
-    options = Options()
-    options.add_argument("--start-maximized")
-    options.add_experimental_option("detach", True)  # keep window for debugging
+def _warm_login(client, drv):
+    from pages.login_page import LoginPage
+
+    LoginPage(drv, client["base_url"]).open_and_login(client["username"], client["password"])
 
-    service = Service(ChromeDriverManager().install())
-    drv = webdriver.Chrome(service=service, options=options)
-    drv.set_page_load_timeout(90)
-    drv.delete_all_cookies()
+
+@pytest.fixture(scope="session")
+def driver_pool(request, clients_data):
+    """Warm browser sessions shared by every test in the session."""
+    profile = profile_name(request.config.getoption("--browser-profile"))
+    prepare = functools.partial(_warm_login, clients_data[0]) if request.config.getoption("--warm-login") else None
+    # launches happen in the background; the pool only blocks when no warm browser is ready
+    spawner = WarmSpawner(functools.partial(launch_chrome, profile),
+                          target=request.config.getoption("--warm-sessions"), prepare=prepare).start()
+    pool = DriverPool(spawner.take, size=request.config.getoption("--pool-size"))
+    yield pool
+    pool.close_all()
+    spawner.close()
+    if spawner.target:
+        get_result_logger().info("[DEBUG] Warm browser queue: %s", spawner.stats())
+
+
+@pytest.fixture(scope="function")
+def driver(driver_pool):
+    """Borrow a warm Chrome from the pool; it is reset (not relaunched) afterwards."""
+    drv = driver_pool.acquire()
 
     yield drv
 
-    try:
-        drv.quit()
-    except Exception:
-        pass
+    driver_pool.release(drv)
 # --- ADD THIS FIXTURE (keeps other logic untouched) -------------------------
 
 @pytest.fixture(scope="session")
@@ -0,0 +1,196 @@
+# flows/async_flows.py
+import asyncio
+import json
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Awaitable, Callable, Iterable, List, Optional, Tuple
+
+from logger_utils import get_result_logger
+from pages.base_page import _FIND_FIRST_FN
+from pages.payment_page import PaymentPage
+from pages.search_page import SearchPage
+from utils.cdp_events import BINDING, CdpEventChannel, page_ws_url
+
+res_log = get_result_logger()
+
+# Reports the first matching locator through the CDP binding as soon as it appears (no polling).
+_WATCH_TEMPLATE = """
+(function () {
+%(find_first)s
+    var specs = %(specs)s, token = %(token)s, done = false, obs = null;
+    function check() {
+        if (done) { return true; }
+        var hit = findFirst(specs);
+        if (!hit) { return false; }
+        done = true;
+        if (obs) { obs.disconnect(); }
+        window.%(binding)s(JSON.stringify({token: token, idx: hit.idx}));
+        return true;
+    }
+    if (!check()) {
+        obs = new MutationObserver(check);
+        obs.observe(document.documentElement, {childList: true, subtree: true, attributes: true});
+    }
+})();
+"""
+
+
+class AsyncSession:
+    """
+    asyncio front-end for one WebDriver session. Blocking WebDriver / page-object
+    calls run on a private single thread (call()), while waits are awaited on CDP
+    events from a CdpEventChannel, so one event loop can drive many sessions.
+    """
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.events: Optional[CdpEventChannel] = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="webdriver")
+
+    async def __aenter__(self):
+        self.loop = asyncio.get_running_loop()
+        ws_url = await self.call(page_ws_url, self.driver)
+        self.events = await CdpEventChannel(ws_url, self.loop).open()
+        return self
+
+    async def __aexit__(self, *exc):
+        if self.events is not None:
+            await self.events.close()
+        self._executor.shutdown(wait=False)
+
+    async def call(self, fn: Callable, *args, **kwargs):
+        """Run a blocking WebDriver / page-object call without blocking the loop."""
+        loop = self.loop or asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, lambda: fn(*args, **kwargs))
+
+    # ---- event-driven waits ----
+    async def locator(self, locators: List[Tuple[str, str]], timeout: float = 20) -> int:
+        """Index of the first locator that appears in the current document (default content)."""
+        token = uuid.uuid4().hex
+        fut = self.events.wait_for(
+            "Runtime.bindingCalled",
+            lambda p: p.get("name") == BINDING and json.loads(p.get("payload", "{}")).get("token") == token,
+        )
+        source = _WATCH_TEMPLATE % {
+            "find_first": _FIND_FIRST_FN,
+            "specs": json.dumps([[by, value] for by, value in locators]),
+            "token": json.dumps(token),
+            "binding": BINDING,
+        }
+        await self.events.send("Runtime.evaluate", {"expression": source})
+        params = await asyncio.wait_for(fut, timeout)
+        return int(json.loads(params["payload"])["idx"])
+
+    async def dialog(self, timeout: float = 20) -> dict:
+        """Next native JS dialog (alert/confirm/prompt)."""
+        return await asyncio.wait_for(self.events.wait_for("Page.javascriptDialogOpening"), timeout)
+
+    async def navigated(self, timeout: float = 30) -> dict:
+        """Next top-level navigation."""
+        fut = self.events.wait_for("Page.frameNavigated", lambda p: not p.get("frame", {}).get("parentId"))
+        return await asyncio.wait_for(fut, timeout)
+
+    async def network_idle(self, idle_ms: int = 500, timeout: float = 20) -> bool:
+        """True once no request has been in flight for idle_ms (CDP Network events)."""
+        inflight = set()
+        changed = asyncio.Event()
+
+        def on_event(method, params):
+            if method == "Network.requestWillBeSent":
+                inflight.add(params.get("requestId"))
+            elif method in ("Network.loadingFinished", "Network.loadingFailed"):
+                inflight.discard(params.get("requestId"))
+            else:
+                return
+            changed.set()
+
+        self.events.add_listener(on_event)
+        deadline = time.monotonic() + timeout
+        try:
+            while time.monotonic() < deadline:
+                changed.clear()
+                wait_s = idle_ms / 1000.0 if not inflight else max(0.0, deadline - time.monotonic())
+                try:
+                    await asyncio.wait_for(changed.wait(), wait_s)
+                except asyncio.TimeoutError:
+                    if not inflight:
+                        return True
+            return False
+        finally:
+            self.events.remove_listener(on_event)
+
+
+class AsyncPaymentFlow:
+    """Payment page steps for an AsyncSession; waits are awaited events, not WebDriverWait polls."""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+        self.page = PaymentPage(session.driver)
+
+    async def open_new_payment(self):
+        await self.session.call(self.page.open_new_payment)
+
+    async def fill(self, payment_type_text: str, amount: str, email: str):
+        await self.session.call(self.page.fill_payment, payment_type_text, amount, email)
+
+    async def submit(self, modal_timeout: float = 4):
+        """Mirrors PaymentPage.submit_payment: a visible modal is confirmed and closed, else nothing to do here."""
+        page = self.page
+        await self.session.call(page.safe_click, page.SUBMIT)
+        try:
+            idx = await self.session.locator(page.MODAL_VISIBLE + page.PAYMENT_DIALOG_ANY + page.SUCCESS_MARKERS,
+                                             modal_timeout)
+        except asyncio.TimeoutError:
+            return  # auto-submit without feedback yet; submitted() keeps waiting
+        if idx < len(page.MODAL_VISIBLE):
+            modal = await self.session.call(page.try_find_any, page.MODAL_VISIBLE, 2)
+            await self.session.call(page.confirm_submit_modal, modal)
+
+    async def submitted(self, timeout: float = 20):
+        """Resolves when the 'Payment submitted' dialog (or a success marker) is on screen."""
+        await self.session.locator(self.page.PAYMENT_DIALOG_ANY + self.page.SUCCESS_MARKERS, timeout)
+
+    async def close_submitted(self):
+        await self.session.call(self.page.handle_payment_submitted_ok)
+
+
+async def pay_ticket_async(session: AsyncSession, client: dict, ticket: dict):
+    """Async counterpart of flows.ticket_flows.pay_ticket (session already on Data → Search)."""
+    search = SearchPage(session.driver)
+    await session.call(search.apply_filters_and_search, "", False)
+    await session.call(search.open_ticket_actions, ticket["ticket_id"])
+    await session.call(search.choose_payment)
+
+    payment = AsyncPaymentFlow(session)
+    await payment.open_new_payment()
+    await payment.fill(ticket.get("payment_type", "Cash"), ticket.get("fine_amount") or client["fine_amount"],
+                       client["username"])
+    await payment.submit()
+    await payment.submitted()
+    await payment.close_submitted()
+
+
+async def run_sessions(drivers: Iterable, flow: Callable[[AsyncSession], Awaitable],
+                       limit: Optional[int] = None) -> List[Tuple[bool, object]]:
+    """
+    Drive many sessions from ONE event loop: flow(session) per driver, at most `limit`
+    at a time. Returns [(ok, result_or_exception), ...] in driver order.
+    """
+    sem = asyncio.Semaphore(limit) if limit else None
+
+    async def one(drv):
+        async def go():
+            async with AsyncSession(drv) as session:
+                return await flow(session)
+        try:
+            if sem is None:
+                return True, await go()
+            async with sem:
+                return True, await go()
+        except Exception as e:
+            res_log.error("[FAIL] Async flow — %s", e)
+            return False, e
+
+    return await asyncio.gather(*(one(d) for d in drivers))
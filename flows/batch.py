@@ -0,0 +1,205 @@
+# flows/batch.py
+import csv
+import json
+import os
+import time
+import traceback
+from dataclasses import asdict, dataclass, field
+from typing import Callable, Iterable, Iterator, List, Optional
+
+from logger_utils import get_debug_file_logger, get_result_logger, get_step_logger, tenant_scope
+from pages.login_page import LoginPage
+from flows.ticket_flows import FLOWS, STAYS_ON_RESULTS, back_to_data_search
+from utils.tab_pool import TabPool
+
+step_log = get_step_logger()
+res_log = get_result_logger()
+debug_log = get_debug_file_logger()
+
+
+def iter_tickets(path: str) -> Iterator[dict]:
+    """
+    Stream tickets from .csv (header row, needs a ticket_id column), .jsonl (one object
+    per line) or plain text (one ticket id per line). Extra columns override client defaults.
+    Rows without a ticket_id (or unparseable .jsonl lines) are logged and skipped.
+    """
+    ext = os.path.splitext(path)[1].lower()
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        if ext == ".csv":
+            reader = csv.DictReader(f)
+            for row in reader:
+                ticket = {k: (v or "").strip() for k, v in row.items() if k}
+                if ticket.get("ticket_id"):
+                    yield ticket
+                else:
+                    step_log.warning("%s:%s has no ticket_id; skipped", path, reader.line_num)
+        elif ext in (".jsonl", ".ndjson"):
+            for lineno, line in enumerate(f, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    ticket = json.loads(line)
+                except ValueError as e:
+                    step_log.warning("%s:%s is not valid JSON (%s); skipped", path, lineno, e)
+                    continue
+                ticket_id = str(ticket.get("ticket_id") or "").strip() if isinstance(ticket, dict) else ""
+                if not ticket_id:
+                    step_log.warning("%s:%s has no ticket_id; skipped", path, lineno)
+                    continue
+                ticket["ticket_id"] = ticket_id
+                yield ticket
+        else:
+            for line in f:
+                line = line.strip()
+                if line and not line.startswith("#"):
+                    yield {"ticket_id": line}
+
+
+@dataclass
+class TicketOutcome:
+    ticket_id: str
+    ok: bool
+    seconds: float
+    error: str = ""
+    client_name: str = ""
+
+
+@dataclass
+class BatchReport:
+    flow: str
+    outcomes: List[TicketOutcome] = field(default_factory=list)
+    started: float = field(default_factory=time.monotonic)
+    finished: Optional[float] = None
+
+    @property
+    def elapsed(self) -> float:
+        return (self.finished or time.monotonic()) - self.started
+
+    @property
+    def passed(self) -> int:
+        return sum(1 for o in self.outcomes if o.ok)
+
+    @property
+    def failed(self) -> int:
+        return len(self.outcomes) - self.passed
+
+    @property
+    def tickets_per_minute(self) -> float:
+        return len(self.outcomes) / self.elapsed * 60.0 if self.elapsed > 0 else 0.0
+
+    def summary(self) -> str:
+        return (f"{self.flow}: {len(self.outcomes)} ticket(s), {self.passed} passed, {self.failed} failed "
+                f"in {self.elapsed:.1f}s ({self.tickets_per_minute:.2f} tickets/min)")
+
+    def write_jsonl(self, path: str):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            for o in self.outcomes:
+                f.write(json.dumps(asdict(o)) + "\n")
+
+
+def run_batch(driver, client: dict, tickets: Iterable[dict], flow: str = "payment",
+              login: bool = True, on_outcome: Optional[Callable[[TicketOutcome], None]] = None,
+              **flow_kwargs) -> BatchReport:
+    """
+    Process tickets one after another in ONE logged-in session: login once, then
+    for each ticket run the flow and go back to Data → Search. A failing ticket is
+    recorded (with a screenshot) and the session is recovered for the next one.
+    """
+    run_flow = FLOWS[flow]
+    report = BatchReport(flow=flow)
+
+    with tenant_scope(client["base_url"]):
+        if login:
+            LoginPage(driver, client["base_url"]).open_and_login(client["username"], client["password"])
+        back_to_data_search(driver)
+
+        for ticket in tickets:
+            ticket_id = ticket["ticket_id"]
+            t0 = time.monotonic()
+            try:
+                run_flow(driver, client, ticket, **flow_kwargs)
+                outcome = TicketOutcome(ticket_id, True, time.monotonic() - t0,
+                                        client_name=client.get("client_name", ""))
+                res_log.info("[SUCCESS] Batch %s — ticket %s (%.1fs)", flow, ticket_id, outcome.seconds)
+            except Exception as e:
+                outcome = TicketOutcome(ticket_id, False, time.monotonic() - t0, f"{type(e).__name__}: {e}",
+                                        client.get("client_name", ""))
+                res_log.error("[FAIL] Batch %s — ticket %s — %s", flow, ticket_id, e)
+                debug_log.debug("Batch ticket %s failed:\n%s", ticket_id, traceback.format_exc())
+                _screenshot(driver, f"batch_{flow}_{ticket_id}_failure.png")
+            report.outcomes.append(outcome)
+            if on_outcome:
+                on_outcome(outcome)
+
+            # after a success the adjustment flow is still on the results, which the next ticket may reuse
+            if not outcome.ok or flow not in STAYS_ON_RESULTS:
+                _recover(driver, client)
+
+    report.finished = time.monotonic()
+    res_log.info("[DEBUG] %s", report.summary())
+    return report
+
+
+def run_batch_in_tabs(driver, client: dict, tickets: Iterable[dict], flow: str = "payment", tabs: int = 3,
+                      login: bool = True, on_outcome: Optional[Callable[[TicketOutcome], None]] = None,
+                      **flow_kwargs) -> BatchReport:
+    """
+    Like run_batch, but interleaves tickets across `tabs` tabs of the same logged-in
+    browser (see utils.tab_pool.TabPool). Each ticket starts from Data → Search in its tab.
+    """
+    run_flow = FLOWS[flow]
+    report = BatchReport(flow=flow)
+    client_name = client.get("client_name", "")
+
+    with tenant_scope(client["base_url"]):
+        if login:
+            LoginPage(driver, client["base_url"]).open_and_login(client["username"], client["password"])
+        app_url = driver.current_url
+
+    def one_ticket(drv, ticket):
+        # runs on a TabPool thread, which does not inherit the caller's tenant_scope
+        with tenant_scope(client["base_url"]):
+            back_to_data_search(drv)
+            try:
+                run_flow(drv, client, ticket, **flow_kwargs)
+            except Exception:
+                _screenshot(drv, f"batch_{flow}_{ticket['ticket_id']}_failure.png")
+                raise
+
+    def collect(result):
+        ticket, ok, value, seconds = result
+        outcome = TicketOutcome(ticket["ticket_id"], ok, seconds,
+                                "" if ok else f"{type(value).__name__}: {value}", client_name)
+        if ok:
+            res_log.info("[SUCCESS] Batch %s — ticket %s (%.1fs)", flow, outcome.ticket_id, seconds)
+        else:
+            res_log.error("[FAIL] Batch %s — ticket %s — %s", flow, outcome.ticket_id, value)
+        report.outcomes.append(outcome)
+        if on_outcome:
+            on_outcome(outcome)
+
+    TabPool(driver, tabs=tabs, start_url=app_url).run(one_ticket, tickets, on_result=collect)
+
+    report.finished = time.monotonic()
+    res_log.info("[DEBUG] %s (%s tabs)", report.summary(), tabs)
+    return report
+
+
+def _recover(driver, client: dict):
+    """Back to Data → Search; re-login only if the navbar is gone (session expired)."""
+    try:
+        driver.switch_to.default_content()
+        back_to_data_search(driver)
+    except Exception:
+        step_log.info("Navbar not reachable; logging in again")
+        LoginPage(driver, client["base_url"]).open_and_login(client["username"], client["password"])
+        back_to_data_search(driver)
+
+
+def _screenshot(driver, name: str):
+    try:
+        driver.save_screenshot(os.path.join("logs", name))
+    except Exception:
+        pass
@@ -0,0 +1,233 @@
+# flows/multi_tenant.py
+"""
+Fan a ticket flow out across every client (tenant) in a data file using a process
+pool with one browser per worker:
+
+    python -m flows.multi_tenant --flow payment --workers 4 --per-tenant 1
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import asdict
+from typing import Dict, List, Optional
+
+from logger_utils import get_result_logger, setup_loggers, shutdown_logging
+from utils.browser_profiles import DEFAULT_PROFILE, launch_chrome
+from utils.driver_service import shutdown_shared_service
+from utils.step_metrics import get_step_metrics
+
+res_log = get_result_logger()
+
+# ---- worker process state: one browser per worker, reused across units ----
+_worker = {"driver": None, "tenant": None, "progress": None}
+
+
+def _init_worker(profile: str, progress):
+    from multiprocessing.util import Finalize
+
+    setup_loggers()
+    _worker["driver"] = launch_chrome(profile)
+    _worker["progress"] = progress
+    # pool workers leave via os._exit, so atexit would not close Chrome
+    Finalize(None, _quit_worker_driver, exitpriority=10)
+    Finalize(None, shutdown_logging, exitpriority=1)  # after the driver, so its last lines are flushed
+
+
+def _quit_worker_driver():
+    drv = _worker.get("driver")
+    if drv is not None:
+        try:
+            drv.quit()
+        except Exception:
+            pass
+    shutdown_shared_service()
+
+
+def _run_unit(client: dict, tickets: List[dict], flow: str, flow_kwargs: dict) -> dict:
+    from flows.batch import run_batch
+
+    drv = _worker["driver"]
+    progress = _worker["progress"]
+    tenant = client["base_url"]
+
+    def publish(outcome):
+        progress.put(asdict(outcome))
+
+    # same tenant as this worker's previous unit, and the browser still on its app → still logged in
+    login = _worker["tenant"] != tenant or not _on_tenant(drv, tenant)
+    _worker["tenant"] = None  # unknown until this unit finishes; a crash mid-unit may leave another app open
+    report = run_batch(drv, client, tickets, flow=flow, login=login, on_outcome=publish, **flow_kwargs)
+    _worker["tenant"] = tenant
+    return {"client_name": client.get("client_name", tenant), "elapsed": report.elapsed,
+            "passed": report.passed, "failed": report.failed,
+            "step_metrics": get_step_metrics().export(clear=True)}
+
+
+def _on_tenant(drv, tenant: str) -> bool:
+    try:
+        return (drv.current_url or "").startswith(tenant.rstrip("/") + "/")
+    except Exception:
+        return False
+
+
+def _positive_int(value: str) -> int:
+    n = int(value)
+    if n < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {n}")
+    return n
+
+
+# ---- parent side ----
+def build_units(clients: List[dict], per_tenant: int) -> List[tuple]:
+    """
+    Split each tenant's tickets into at most `per_tenant` units. Tickets come from
+    client["tickets"] (list of ids or dicts) or the single client["ticket_id"].
+    """
+    units = []
+    for client in clients:
+        raw = client.get("tickets") or [client["ticket_id"]]
+        tickets = [t if isinstance(t, dict) else {"ticket_id": t} for t in raw]
+        chunks = max(1, min(per_tenant, len(tickets)))
+        for i in range(chunks):
+            part = tickets[i::chunks]
+            if part:
+                units.append((client, part))
+    return units
+
+
+def run_all_tenants(clients: List[dict], flow: str = "payment", workers: int = 4, per_tenant: int = 1,
+                    profile: str = DEFAULT_PROFILE, results_path: Optional[str] = None, **flow_kwargs) -> dict:
+    """
+    Run `flow` for every tenant. At most `per_tenant` units of the same base_url are in
+    flight at once. Per-ticket outcomes stream to results_path (JSONL) as they arrive.
+    Returns the merged summary.
+    """
+    if workers < 1 or per_tenant < 1:
+        raise ValueError(f"workers and per_tenant must be at least 1 (got {workers}, {per_tenant})")
+    results_path = results_path or os.path.join("logs", f"multi_tenant_{flow}.jsonl")
+    os.makedirs(os.path.dirname(results_path) or ".", exist_ok=True)
+
+    manager = multiprocessing.Manager()
+    progress = manager.Queue()
+    per_tenant_stats: Dict[str, dict] = defaultdict(lambda: {"passed": 0, "failed": 0, "seconds": 0.0})
+    done = threading.Event()
+    started = time.monotonic()
+
+    def drain():
+        # shared progress + result stream: one JSON line per ticket, as soon as it finishes
+        with open(results_path, "w", encoding="utf-8") as out:
+            while not (done.is_set() and progress.empty()):
+                try:
+                    item = progress.get(timeout=0.5)
+                except queue.Empty:
+                    continue
+                out.write(json.dumps(item) + "\n")
+                out.flush()
+                stats = per_tenant_stats[item.get("client_name") or "?"]
+                stats["passed" if item["ok"] else "failed"] += 1
+                stats["seconds"] += item["seconds"]
+                total = sum(s["passed"] + s["failed"] for s in per_tenant_stats.values())
+                res_log.info("[DEBUG] [%s] %s %s (%d done)", item.get("client_name"), item["ticket_id"],
+                             "PASS" if item["ok"] else "FAIL", total)
+
+    drainer = threading.Thread(target=drain, name="tenant-progress", daemon=True)
+    drainer.start()
+
+    pending = build_units(clients, per_tenant)
+    in_flight: Dict[object, str] = {}
+    tenant_load: Dict[str, int] = defaultdict(int)
+    errors: List[str] = []
+
+    try:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(profile, progress)) as pool:
+            while pending or in_flight:
+                # submit everything the per-tenant cap allows
+                try:
+                    for unit in list(pending):
+                        client, tickets = unit
+                        tenant = client["base_url"]
+                        if tenant_load[tenant] >= per_tenant or len(in_flight) >= workers:
+                            continue
+                        fut = pool.submit(_run_unit, client, tickets, flow, flow_kwargs)
+                        pending.remove(unit)
+                        tenant_load[tenant] += 1
+                        in_flight[fut] = tenant
+                except BrokenProcessPool as e:
+                    # a worker died (e.g. Chrome took the process down); nothing more can be submitted
+                    res_log.error("[FAIL] Worker pool broke — %s; %s unit(s) not run", e, len(pending))
+                    errors.extend(f"{client['base_url']}: not run ({len(tickets)} ticket(s)), worker pool broke"
+                                  for client, tickets in pending)
+                    pending.clear()
+                    if not in_flight:
+                        break
+
+                finished, _ = wait(list(in_flight), return_when=FIRST_COMPLETED)
+                for fut in finished:
+                    tenant = in_flight.pop(fut)
+                    tenant_load[tenant] -= 1
+                    try:
+                        get_step_metrics().merge(fut.result()["step_metrics"])
+                    except Exception as e:
+                        errors.append(f"{tenant}: {type(e).__name__}: {e}")
+                        res_log.error("[FAIL] Tenant unit %s crashed — %s", tenant, e)
+    finally:
+        done.set()
+        drainer.join()
+        manager.shutdown()
+
+    elapsed = time.monotonic() - started
+    steps_path = os.path.splitext(results_path)[0] + "_steps.json"
+    get_step_metrics().write_report(steps_path)
+    total = sum(s["passed"] + s["failed"] for s in per_tenant_stats.values())
+    summary = {
+        "flow": flow,
+        "tenants": dict(per_tenant_stats),
+        "tickets": total,
+        "passed": sum(s["passed"] for s in per_tenant_stats.values()),
+        "failed": sum(s["failed"] for s in per_tenant_stats.values()),
+        "elapsed": round(elapsed, 1),
+        "tickets_per_minute": round(total / elapsed * 60.0, 2) if elapsed > 0 else 0.0,
+        "unit_errors": errors,
+        "results": results_path,
+        "step_metrics": steps_path,
+    }
+    res_log.info("[DEBUG] Multi-tenant %s: %s ticket(s), %s failed across %s tenant(s) in %.1fs",
+                 flow, total, summary["failed"], len(per_tenant_stats), elapsed)
+    return summary
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--data", default=os.path.join("data", "ledger_client_data.json"))
+    parser.add_argument("--flow", default="payment", choices=["payment", "adjustment"])
+    parser.add_argument("--workers", type=_positive_int, default=4)
+    parser.add_argument("--per-tenant", type=_positive_int, default=1)
+    parser.add_argument("--profile", default=os.environ.get("LEDGER_BROWSER_PROFILE", DEFAULT_PROFILE))
+    parser.add_argument("--void-after", action="store_true", help="payment flow: void the payment again")
+    args = parser.parse_args(argv)
+
+    setup_loggers()
+    with open(args.data, "r", encoding="utf-8") as f:
+        clients = json.load(f)["clients"]
+
+    flow_kwargs = {"void_after": True} if args.flow == "payment" and args.void_after else {}
+    summary = run_all_tenants(clients, flow=args.flow, workers=args.workers, per_tenant=args.per_tenant,
+                              profile=args.profile, **flow_kwargs)
+
+    summary_path = os.path.join("logs", f"multi_tenant_{args.flow}_summary.json")
+    with open(summary_path, "w", encoding="utf-8") as f:
+        json.dump(summary, f, indent=2)
+    print(json.dumps(summary, indent=2))
+    return 0 if not summary["failed"] and not summary["unit_errors"] else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
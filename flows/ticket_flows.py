@@ -0,0 +1,53 @@
+# flows/ticket_flows.py
+from pages.adjustment_page import AdjustmentPage
+from pages.navbar_page import NavBar
+from pages.payment_page import PaymentPage
+from pages.search_page import SearchPage
+
+# Single-ticket flows that assume a logged-in session sitting on (or able to reach) Data → Search.
+# They are the building blocks for the batch / multi-tenant runners.
+
+
+def pay_ticket(driver, client: dict, ticket: dict, void_after: bool = False):
+    """New cash payment on one ticket (optionally voided right after, like test_full_payment)."""
+    ticket_id = ticket["ticket_id"]
+    amount = ticket.get("fine_amount") or client.get("fine_amount")
+
+    search = SearchPage(driver)
+    search.apply_filters_and_search(serial_number="", press_enter_if_no_button=False)
+    search.open_ticket_actions(ticket_id)
+    search.choose_payment()
+
+    pay = PaymentPage(driver)
+    pay.open_new_payment()
+    pay.fill_payment(ticket.get("payment_type", "Cash"), amount, client["username"])
+    pay.submit_payment()
+    pay.handle_payment_submitted_ok()
+
+    if void_after:
+        pay.void_latest_payment(ticket.get("void_reason", "Void by officer"))
+
+
+def adjust_ticket(driver, client: dict, ticket: dict, reuse_results: bool = True):
+    """Add one adjustment (amount/reason per ticket, else the client's defaults)."""
+    ticket_id = ticket["ticket_id"]
+
+    adj = AdjustmentPage(driver)
+    adj.search_ticket(ticket_id, reuse_results=reuse_results)
+    adj.open_payment_from_row(ticket_id)
+    adj.add_adjustment(ticket.get("amount") or client["amount"], ticket.get("reason") or client["reason"])
+    adj.close_ticket_view()
+
+
+def back_to_data_search(driver):
+    """Return to Data → Search between tickets (no re-login)."""
+    NavBar(driver).open_data_search()
+
+
+FLOWS = {
+    "payment": pay_ticket,
+    "adjustment": adjust_ticket,
+}
+
+# Flows that end back on the Data → Search results, so the next ticket can reuse them
+STAYS_ON_RESULTS = {"adjustment"}
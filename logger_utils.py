@@ -1,9 +1,20 @@
+import atexit
+import contextvars
 import logging
 import os
-from logging.handlers import RotatingFileHandler
+import queue
+import reprlib
+import threading
+import time
+from contextlib import contextmanager
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from typing import Callable
 import functools
 
+from utils.command_audit import get_command_audit
+from utils.step_metrics import get_step_metrics
+from utils.tracing import get_tracer
+
 LOG_DIR = os.path.join(os.getcwd(), "logs")
 os.makedirs(LOG_DIR, exist_ok=True)
 
@@ -11,6 +22,21 @@ STEP_LOG_PATH = os.path.join(LOG_DIR, "steps.log")
 RESULT_LOG_PATH = os.path.join(LOG_DIR, "result.log")
 DEBUG_LOG_PATH = os.path.join(LOG_DIR, "debug.log")
 
+# upper bound for the args/kwargs text log_step writes to debug.log
+ARG_REPR_LIMIT = int(os.environ.get("LEDGER_LOG_ARG_LIMIT", "300"))
+
+# logger name → (file, level); all three are written by one background QueueListener
+_FILE_LOGGERS = {
+    "steps": (STEP_LOG_PATH, logging.INFO),
+    "result": (RESULT_LOG_PATH, logging.INFO),
+    "debugfile": (DEBUG_LOG_PATH, logging.DEBUG),
+}
+
+_log_queue = queue.SimpleQueue()
+_listener = None
+_listener_pid = None
+_listener_lock = threading.RLock()
+
 def _build_file_handler(path: str, level: int) -> RotatingFileHandler:
     handler = RotatingFileHandler(path, maxBytes=2_000_000, backupCount=3, encoding="utf-8")
     handler.setLevel(level)
@@ -20,25 +46,91 @@ def _build_file_handler(path: str, level: int) -> RotatingFileHandler:
     ))
     return handler
 
+class _DeferredQueueHandler(QueueHandler):
+    """Enqueue the record as-is: message formatting and file I/O happen on the listener thread."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        if _listener_pid != os.getpid():  # forked worker: the parent's listener thread did not come along
+            _start_listener()
+        return record
+
+
+def _start_listener():
+    global _log_queue, _listener, _listener_pid
+    with _listener_lock:
+        if _listener is not None and _listener_pid == os.getpid():
+            return
+        if _listener_pid is not None:
+            # inherited across fork: fresh queue so the parent's backlog is not written twice
+            _log_queue = queue.SimpleQueue()
+            for name in _FILE_LOGGERS:
+                for h in logging.getLogger(name).handlers:
+                    if isinstance(h, _DeferredQueueHandler):
+                        h.queue = _log_queue
+        handlers = []
+        for name, (path, level) in _FILE_LOGGERS.items():
+            handler = _build_file_handler(path, level)
+            handler.addFilter(logging.Filter(name))
+            handlers.append(handler)
+        _listener = QueueListener(_log_queue, *handlers, respect_handler_level=True)
+        _listener.start()
+        _listener_pid = os.getpid()
+    atexit.register(shutdown_logging)
+
+
+def shutdown_logging():
+    """
+    Drain the queue and close the files. Safe to call more than once; records logged
+    afterwards (late atexit hooks) are written synchronously.
+    """
+    global _listener
+    with _listener_lock:
+        if _listener is None or _listener_pid != os.getpid():
+            return
+        _listener.stop()
+        for name in _FILE_LOGGERS:
+            logger = logging.getLogger(name)
+            for h in list(logger.handlers):
+                if isinstance(h, _DeferredQueueHandler):
+                    logger.removeHandler(h)
+        for name, handler in zip(_FILE_LOGGERS, _listener.handlers):
+            logging.getLogger(name).addHandler(handler)
+        _listener = None
+
+
 def setup_loggers():
     # file-only loggers; do not propagate to root console
-    steps = logging.getLogger("steps")
-    if not steps.handlers:
-        steps.setLevel(logging.INFO)
-        steps.addHandler(_build_file_handler(STEP_LOG_PATH, logging.INFO))
-        steps.propagate = False
-
-    result = logging.getLogger("result")
-    if not result.handlers:
-        result.setLevel(logging.INFO)
-        result.addHandler(_build_file_handler(RESULT_LOG_PATH, logging.INFO))
-        result.propagate = False
-
-    debugfile = logging.getLogger("debugfile")
-    if not debugfile.handlers:
-        debugfile.setLevel(logging.DEBUG)
-        debugfile.addHandler(_build_file_handler(DEBUG_LOG_PATH, logging.DEBUG))
-        debugfile.propagate = False
+    for name, (_, level) in _FILE_LOGGERS.items():
+        logger = logging.getLogger(name)
+        if not logger.handlers:
+            logger.setLevel(level)
+            logger.addHandler(_DeferredQueueHandler(_log_queue))
+            logger.propagate = False
+    if _listener_pid != os.getpid():
+        _start_listener()
+
+
+class _BoundedRepr:
+    """repr() of log_step arguments, computed only when the record is written and capped in size."""
+
+    _repr = reprlib.Repr()
+    _repr.maxstring = _repr.maxother = 80
+    _repr.maxlist = _repr.maxtuple = _repr.maxdict = 6
+    _repr.maxlevel = 3
+
+    __slots__ = ("value",)
+
+    def __init__(self, value):
+        self.value = value
+
+    def __str__(self) -> str:
+        try:
+            text = self._repr.repr(self.value)
+        except Exception as e:
+            text = f"<unrepresentable {type(self.value).__name__}: {e}>"
+        if len(text) > ARG_REPR_LIMIT:
+            text = text[:ARG_REPR_LIMIT - 3] + "..."
+        return text
 
 def get_step_logger() -> logging.Logger:
     setup_loggers()
@@ -52,12 +144,46 @@ def get_debug_file_logger() -> logging.Logger:
     setup_loggers()
     return logging.getLogger("debugfile")
 
+_tenant: contextvars.ContextVar = contextvars.ContextVar("ledger_step_tenant", default="")
+
+@contextmanager
+def tenant_scope(base_url: str):
+    """Steps run inside are reported under this tenant, whatever their first argument is."""
+    token = _tenant.set(base_url.rstrip("/") + "/" if base_url else "")
+    try:
+        yield
+    finally:
+        _tenant.reset(token)
+
+def _step_tenant(args) -> str:
+    """Explicit tenant_scope first, else what the page object knows (at most one current_url per page)."""
+    explicit = _tenant.get()
+    if explicit:
+        return explicit
+    page = args[0] if args else None
+    tenant = getattr(page, "tenant_url", None)
+    if not tenant and callable(getattr(page, "_tenant_key", None)):
+        try:
+            tenant = page._tenant_key()
+        except Exception:
+            tenant = ""
+    return tenant or ""
+
+def _flag_chatty(steps: logging.Logger, audit, commands):
+    """Warn about a step that blew its WebDriver round-trip budget or repeated the same find."""
+    issues = audit.problems(commands)
+    if issues:
+        steps.warning("[DEBUG] %s — chatty: %s", commands.name, "; ".join(issues))
+
 # logger_utils.py
 def log_step(name: str) -> Callable:
-    """Decorator to auto-log with clean console tags."""
+    """Decorator to auto-log with clean console tags; durations go to utils.step_metrics."""
     steps = get_step_logger()
     result = get_result_logger()
     debugf = get_debug_file_logger()
+    metrics = get_step_metrics()
+    tracer = get_tracer()
+    audit = get_command_audit()
 
     def decorator(func: Callable) -> Callable:
         @functools.wraps(func)
@@ -65,17 +191,28 @@ def log_step(name: str) -> Callable:
             # console sees this line (because it has [DEBUG])
             steps.info("[DEBUG] %s — START", name)
             # file-only deep trace
-            debugf.debug("START %s args=%s kwargs=%s", name, args, kwargs)
+            if debugf.isEnabledFor(logging.DEBUG):
+                debugf.debug("START %s args=%s kwargs=%s", name, _BoundedRepr(args), _BoundedRepr(kwargs))
+            t0 = time.monotonic()
+            commands = None
             try:
-                out = func(*args, **kwargs)
+                with tracer.span(name, "step"), audit.step(name) as commands:
+                    out = func(*args, **kwargs)
+                elapsed = time.monotonic() - t0
+                metrics.record(name, _step_tenant(args), "PASS", elapsed)
+                _flag_chatty(steps, audit, commands)
                 # console sees only this PASS line
                 result.info("[SUCCESS] %s", name)
-                steps.info("[DEBUG] %s — END (PASS)", name)
+                steps.info("[DEBUG] %s — END (PASS) in %.2fs", name, elapsed)
                 return out
             except Exception as e:
+                elapsed = time.monotonic() - t0
+                metrics.record(name, _step_tenant(args), "FAIL", elapsed)
+                if commands is not None:
+                    _flag_chatty(steps, audit, commands)
                 # console sees only this FAIL line
                 result.error("[FAIL] %s — %s", name, e)
-                steps.error("[DEBUG] %s — END (FAIL) — %s", name, e)
+                steps.error("[DEBUG] %s — END (FAIL) in %.2fs — %s", name, elapsed, e)
                 raise
         return wrapper
     return decorator
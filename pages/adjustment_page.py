@@ -1,14 +1,13 @@
 # pages/adjustment_page.py
 import os
-import time
 from selenium.webdriver.common.by import By
 from .base_page import BasePage
 from logger_utils import log_step
+from utils.results_index import results_index_for
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.common.action_chains import ActionChains
-import time
 
 class AdjustmentPage(BasePage):
     # ==== Search/Data page ====
@@ -62,7 +61,12 @@ class AdjustmentPage(BasePage):
         self.safe_click(self.SEARCH_LINK)
 
     @log_step("Search ticket on Data → Search")
-    def search_ticket(self, ticket_id: str):
+    def search_ticket(self, ticket_id: str, reuse_results: bool = False):
+        # Batch runs: skip the re-search if the rendered results already hold this ticket
+        if reuse_results and ticket_id in results_index_for(self.driver):
+            self.debug_log.debug("Ticket %s already in results index; not re-searching.", ticket_id)
+            return
+
         # Clear date range (ensures results show)
         try:
             self.safe_click(self.DATE_RANGE)
@@ -79,8 +83,21 @@ class AdjustmentPage(BasePage):
         self.safe_click(self.PRIMARY_SEARCH_BTN)
         self.try_find_any(self.ROW_OFFICER_CELL, timeout=10)
 
+    # Payment link relative to an indexed results row
+    ROW_PAYMENT_LINK_REL = (By.XPATH, ".//a[normalize-space()='Payment']")
+
     @log_step("Open Payment panel from row actions")
-    def open_payment_from_row(self):
+    def open_payment_from_row(self, ticket_id: str = None):
+        # With a ticket id, click the Payment link inside that ticket's row (results not filtered)
+        row = results_index_for(self.driver).get(ticket_id) if ticket_id else None
+        if row is not None:
+            try:
+                el = row.element.find_element(*self.ROW_PAYMENT_LINK_REL)
+                self._scroll_into_view(el)
+                self._js_click(el)
+                return
+            except Exception as e:
+                self.debug_log.debug("Row Payment link for %s not usable (%s)", ticket_id, e)
         self.safe_click(self.PAYMENT_LINK)
     # @log_step("Add adjustment")
     # def add_adjustment(self, amount: str, reason: str):
@@ -714,12 +731,14 @@ class AdjustmentPage(BasePage):
         box = self.try_find_any(self.FINANCE_SEARCH_INPUT, timeout=10)
         box.clear()
         box.send_keys(ticket_id)
+        self.start_dom_watch()
         self.safe_click(self.FINANCE_SEARCH_BTN)
 
     @log_step("Capture Finance evidence & log latest action")
     def capture_finance_evidence(self, ticket_id: str) -> str:
         self._ensure_dirs()
-        time.sleep(2)  # small wait so the grid has data
+        # wait for the grid redraw started by the Finance search
+        self.wait_for_dom_settled(quiet_ms=500, timeout=8, require_change=True)
 
         # Grab status cell text if present
         latest_text = ""
@@ -1,31 +1,189 @@
 # pages/base_page.py
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, ElementClickInterceptedException, ElementNotInteractableException
+from selenium.common.exceptions import TimeoutException, ElementClickInterceptedException, ElementNotInteractableException, WebDriverException
 from selenium.webdriver.common.action_chains import ActionChains
-from typing import List, Tuple, Optional
+from selenium.webdriver.remote.webelement import WebElement
+from typing import Dict, List, Tuple, Optional
+from urllib.parse import urlsplit
+import re
+import time
 from logger_utils import get_step_logger, get_debug_file_logger
+from utils.frame_map import frame_map_for, switch_to_path
+from utils.network_idle import DEFAULT_IGNORE, heuristic_ready, tracker_for
+from utils.tab_pool import current_tab
+from utils.tracing import traced
+from utils.waits import PollingWait
+
+# findFirst([[by, value], ...]) → {el, idx} of the first locator that matches, or null.
+# Invalid selectors are skipped so one broken fallback never masks the others.
+_FIND_FIRST_FN = """
+function byText(value, partial) {
+    var links = document.getElementsByTagName('a');
+    for (var i = 0; i < links.length; i++) {
+        var t = (links[i].innerText || links[i].textContent || '').trim();
+        if (partial ? t.indexOf(value) !== -1 : t === value) { return links[i]; }
+    }
+    return null;
+}
+function findOne(spec) {
+    var by = spec[0], value = spec[1];
+    try {
+        if (by === 'id') { return document.getElementById(value); }
+        if (by === 'xpath') {
+            return document.evaluate(value, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+        }
+        if (by === 'css selector') { return document.querySelector(value); }
+        if (by === 'name') { return document.getElementsByName(value)[0] || null; }
+        if (by === 'class name') { return document.getElementsByClassName(value)[0] || null; }
+        if (by === 'tag name') { return document.getElementsByTagName(value)[0] || null; }
+        if (by === 'link text') { return byText(value, false); }
+        if (by === 'partial link text') { return byText(value, true); }
+    } catch (e) { }
+    return null;
+}
+function findFirst(specs) {
+    for (var i = 0; i < specs.length; i++) {
+        var el = findOne(specs[i]);
+        if (el) { return {el: el, idx: i}; }
+    }
+    return null;
+}
+"""
+
+# Evaluates every locator in one round trip
+_FIND_FIRST_JS = _FIND_FIRST_FN + "return findFirst(arguments[0]);"
+
+# Answers a whole dict of queries (see BasePage.read_many) in one round trip
+_READ_MANY_JS = _FIND_FIRST_FN + """
+function isVisible(el) {
+    if (!el.getClientRects().length) { return false; }
+    var st = window.getComputedStyle(el);
+    return st.visibility !== 'hidden' && st.display !== 'none' && st.opacity !== '0';
+}
+var queries = arguments[0], out = {};
+Object.keys(queries).forEach(function (name) {
+    var q = queries[name];
+    try {
+        if (q.read === 'js') { out[name] = (new Function(q.js))(); return; }
+        var hit = findFirst(q.locators), el = hit ? hit.el : null;
+        if (q.read === 'exists') { out[name] = !!el; }
+        else if (q.read === 'visible') { out[name] = !!el && isVisible(el); }
+        else if (q.read === 'attr') { out[name] = el ? el.getAttribute(q.name) : null; }
+        else { out[name] = el ? (el.innerText || el.textContent || '').trim() : ''; }
+    } catch (e) { out[name] = null; }
+});
+return out;
+"""
+
+# Installs (once) a MutationObserver under root and reports {quiet: ms since last mutation, changes}.
+# arguments: key, root css ('' = body), stop (disconnect and forget).
+_DOM_WATCH_JS = """
+var key = arguments[0], sel = arguments[1], stop = arguments[2];
+var watches = window.__ledgerDomWatch = window.__ledgerDomWatch || {};
+var st = watches[key];
+if (stop) { if (st) { st.obs.disconnect(); delete watches[key]; } return null; }
+if (!st) {
+    var root = sel ? document.querySelector(sel) : document.body;
+    if (!root) { return null; }
+    st = {last: Date.now(), changes: 0};
+    st.obs = new MutationObserver(function () { st.last = Date.now(); st.changes++; });
+    st.obs.observe(root, {childList: true, subtree: true, attributes: true, characterData: true});
+    watches[key] = st;
+}
+return {quiet: Date.now() - st.last, changes: st.changes};
+"""
+
 
 class BasePage:
     def __init__(self, driver, wait: int = 20):
         self.driver = driver
-        self.wait = WebDriverWait(driver, wait)
+        self.wait = PollingWait(driver, wait)
         self.step_log = get_step_logger()
         self.debug_log = get_debug_file_logger()
+        self._tenant: Optional[str] = None
+
+    def _tenant_key(self) -> str:
+        """Tenant base_url (scheme://host/<tenant>/) of the current page, resolved once per page object."""
+        if self._tenant is None:
+            try:
+                parts = urlsplit(self.driver.current_url or "")
+            except Exception:
+                return ""
+            if not parts.netloc:
+                return ""  # about:blank etc. — try again on the next lookup
+            first = [seg for seg in parts.path.split("/") if seg][:1]
+            self._tenant = f"{parts.scheme}://{parts.netloc}/" + (first[0] + "/" if first else "")
+        return self._tenant
 
     def try_find_any(self, locators: List[Tuple[By, str]], timeout: int = 20):
-        last_exc: Optional[Exception] = None
-        for by, value in locators:
+        el, _ = self.find_first_match(locators, timeout)
+        return el
+
+    @traced()
+    def find_first_match(self, locators: List[Tuple[By, str]], timeout: int = 20) -> Tuple[WebElement, int]:
+        """
+        Poll ALL locators together (one in-browser script per poll) and return
+        (element, index of the locator that won). Worst case is one timeout, not N.
+        When several match, the earliest in source order wins.
+        """
+        specs = [[by, value] for by, value in locators]
+        self.debug_log.debug("find_first_match: polling %s locator(s) %s", len(specs), locators)
+
+        def first_match(driver):
             try:
-                self.debug_log.debug("try_find_any: trying %s = %s", by, value)
-                el = WebDriverWait(self.driver, timeout).until(EC.presence_of_element_located((by, value)))
-                return el
-            except Exception as e:
-                last_exc = e
-                self.debug_log.debug("try_find_any: failed %s = %s (%s)", by, value, e)
+                hit = driver.execute_script(_FIND_FIRST_JS, specs)
+            except WebDriverException as e:
+                # page mid-navigation / script blocked: fall back to native finds this poll
+                self.debug_log.debug("find_first_match: script poll failed (%s); native poll", e)
+                hit = self._native_first_match(locators)
+            return hit or False
+
+        try:
+            hit = PollingWait(self.driver, timeout).until(first_match)
+        except TimeoutException as e:
+            raise TimeoutException(f"None of the locators matched: {locators}") from e
+
+        if isinstance(hit, dict):
+            el, idx = hit["el"], int(hit["idx"])
+        else:
+            el, idx = hit
+        self.debug_log.debug("find_first_match: won by %s", locators[idx])
+        return el, idx
+
+    @traced()
+    def read_many(self, queries: Dict[str, object]) -> Dict[str, object]:
+        """
+        Read many values in ONE execute_script. Each query is either a locator list
+        (→ stripped text, '' if missing) or a dict:
+            {"locators": [...], "read": "text" | "exists" | "visible"}
+            {"locators": [...], "read": "attr", "name": "href"}
+            {"js": "return document.readyState"}
+        Returns {name: value}; missing elements give '' / False / None.
+        """
+        payload = {}
+        for name, q in queries.items():
+            if isinstance(q, list):
+                q = {"locators": q, "read": "text"}
+            elif "js" in q:
+                q = {"read": "js", "js": q["js"]}
+            payload[name] = {
+                "read": q.get("read", "text"),
+                "name": q.get("name"),
+                "js": q.get("js"),
+                "locators": [[by, value] for by, value in q.get("locators", [])],
+            }
+        return self.driver.execute_script(_READ_MANY_JS, payload) or {}
+
+    def _native_first_match(self, locators: List[Tuple[By, str]]):
+        for idx, (by, value) in enumerate(locators):
+            try:
+                found = self.driver.find_elements(by, value)
+            except Exception:
                 continue
-        raise TimeoutException(f"None of the locators matched: {locators}") from last_exc
+            if found:
+                return found[0], idx
+        return None
 
     def _scroll_into_view(self, el):
         try:
@@ -36,6 +194,7 @@ class BasePage:
     def _js_click(self, el):
         self.driver.execute_script("arguments[0].click();", el)
 
+    @traced()
     def safe_click(self, locators: List[Tuple[By, str]], timeout: int = 20):
         el = self.try_find_any(locators, timeout)
         self._scroll_into_view(el)
@@ -50,33 +209,111 @@ class BasePage:
             except Exception:
                 self._js_click(el)
     # Add this method in BasePage class
+    @traced()
     def wait_for_page_ready(self, timeout: int = 15):
         """
         Wait until the page's document.readyState == 'complete'
         and (if exists) jQuery AJAX calls are finished.
         """
-        import time
-        from selenium.webdriver.support.ui import WebDriverWait
 
         self.debug_log.debug("Waiting for page ready state...")
 
-        def page_ready(driver):
-            try:
-                ready_state = driver.execute_script("return document.readyState")
-                jquery_active = driver.execute_script("return window.jQuery ? jQuery.active : 0")
-                return ready_state == "complete" and jquery_active == 0
-            except Exception:
-                # Even if jQuery not found or other errors, continue checking document.readyState
-                try:
-                    return driver.execute_script("return document.readyState") == "complete"
-                except Exception:
-                    return False
-
-        WebDriverWait(self.driver, timeout).until(page_ready)
-        time.sleep(1)  # small buffer to ensure stability
+        # readyState + jQuery.active in a single execute_script per poll
+        PollingWait(self.driver, timeout).until(heuristic_ready)
+        # short quiet window instead of a fixed buffer sleep
+        self.wait_for_dom_settled(quiet_ms=300, timeout=3)
         self.debug_log.debug("Page ready state confirmed.")
 
+    @traced()
+    def wait_for_network_idle(self, idle_ms: int = 500, ignore_patterns: Optional[List[str]] = None,
+                              timeout: float = 15, expect_request: float = 0) -> bool:
+        """
+        Wait until no request (except ignore_patterns regexes) has been in flight for idle_ms,
+        using CDP Network events. Falls back to readyState + jQuery.active on non-Chromium drivers.
+        The quiet window never starts before this call, so a request triggered just before it
+        (not yet in the performance log) is still waited for. With expect_request > 0, also wait
+        up to that many seconds for some request to start after the call. Returns False on timeout.
+        """
+        tracker = tracker_for(self.driver)
+        tab = current_tab(self.driver)
+        patterns = [re.compile(p) for p in (DEFAULT_IGNORE if ignore_patterns is None else ignore_patterns)]
+        start = time.monotonic()
+        state = {"idle_since": None}
+
+        def idle(driver):
+            tracker.pump()
+            if not tracker.available:
+                return heuristic_ready(driver)
+            if tracker.pending(patterns, tab):
+                state["idle_since"] = None
+                return False
+            now = time.monotonic()
+            last = tracker.activity(tab)
+            if expect_request and last < start and now - start < expect_request:
+                return False  # the request we are waiting for has not shown up yet
+            if state["idle_since"] is None:
+                # quiet since the last request started/finished, but never since before this call
+                state["idle_since"] = max(last, start)
+            return (now - state["idle_since"]) * 1000.0 >= idle_ms
+
+        try:
+            PollingWait(self.driver, timeout, poll_frequency=0.1).until(idle)
+            return True
+        except TimeoutException:
+            self.debug_log.debug("Network not idle within %ss (%s in flight)", timeout, len(tracker.inflight))
+            return False
+
+    # ---------- DOM-settled waits (MutationObserver) ----------
+    def start_dom_watch(self, root_css: str = "", key: Optional[str] = None):
+        """
+        Install the observer now, e.g. right before clicking Search, so that a
+        later wait_for_dom_settled(require_change=True) sees the redraw it triggers.
+        Pass a dedicated key for a watch that must survive other waits in between.
+        """
+        try:
+            self.driver.execute_script(_DOM_WATCH_JS, key or root_css or "body", root_css, False)
+        except Exception as e:
+            self.debug_log.debug("start_dom_watch failed (%s)", e)
+
+    def stop_dom_watch(self, root_css: str = "", key: Optional[str] = None):
+        try:
+            self.driver.execute_script(_DOM_WATCH_JS, key or root_css or "body", root_css, True)
+        except Exception:
+            pass
+
+    @traced()
+    def wait_for_dom_settled(self, root_css: str = "", quiet_ms: int = 300, timeout: float = 10,
+                             require_change: bool = False, key: Optional[str] = None) -> bool:
+        """
+        Wait until the DOM under root_css (default: body) has had no mutations for quiet_ms.
+        With require_change, at least one mutation must have happened first (table redraw).
+        Returns False instead of raising on timeout, so it can replace fixed sleeps safely.
+        The watch (key, default root_css/body) is removed afterwards.
+        """
+        key = key or root_css or "body"
+
+        def settled(driver):
+            state = driver.execute_script(_DOM_WATCH_JS, key, root_css, False)
+            if not state:
+                return False
+            if require_change and not state["changes"]:
+                return False
+            return state["quiet"] >= quiet_ms
 
+        try:
+            PollingWait(self.driver, timeout, poll_frequency=0.1).until(settled)
+            return True
+        except TimeoutException:
+            self.debug_log.debug("DOM under '%s' did not settle within %ss", key, timeout)
+            return False
+        except Exception as e:
+            self.debug_log.debug("wait_for_dom_settled error (%s)", e)
+            return False
+        finally:
+            self.stop_dom_watch(root_css, key)
+
+
+    @traced()
     def safe_type(self, locators: List[Tuple[By, str]], text: str, timeout: int = 20, clear_first=True):
         el = self.try_find_any(locators, timeout)
         self._scroll_into_view(el)
@@ -86,9 +323,10 @@ class BasePage:
         el.send_keys(text)
 
     # ---------- window / iframe helpers ----------
+    @traced()
     def switch_to_last_window(self, timeout: int = 15):
         self.step_log.info("Checking for new window/tab...")
-        WebDriverWait(self.driver, timeout).until(lambda d: len(d.window_handles) >= 1)
+        PollingWait(self.driver, timeout).until(lambda d: len(d.window_handles) >= 1)
         handles = self.driver.window_handles
         self.debug_log.debug("window handles: %s", handles)
         self.driver.switch_to.window(handles[-1])
@@ -97,38 +335,80 @@ class BasePage:
     def switch_to_default_content(self):
         self.driver.switch_to.default_content()
 
+    @traced()
     def try_find_in_any_iframe(self, locators: List[Tuple[By, str]], timeout_per_iframe: int = 6):
-        self.switch_to_default_content()
+        """
+        Find in default content or any (nested) iframe. The frame tree is reused within a
+        page load while the top-level frame count is unchanged, and re-listed once when a
+        scan misses (late-injected frames). The frame a locator set was last found in is
+        tried first; tree and memo are dropped when the page navigates.
+        """
+        fmap = frame_map_for(self.driver)
+        fmap.sync(self.driver)  # also switches to default content
+        key = tuple(locators)
+
+        path = fmap.memo.get(key)
+        if path is not None:
+            try:
+                switch_to_path(self.driver, path)
+                el = self.try_find_any(locators, timeout=timeout_per_iframe)
+                self.debug_log.debug("Found element in memoized frame %s", path or "default")
+                return el
+            except Exception as e:
+                self.debug_log.debug("Memoized frame %s missed (%s); rescanning", path, e)
+                fmap.memo.pop(key, None)
+                self.switch_to_default_content()
+
         try:
-            return self.try_find_any(locators, timeout=3)
+            el = self.try_find_any(locators, timeout=3)
+            fmap.memo[key] = ()
+            return el
         except Exception:
             pass
 
-        iframes = self.driver.find_elements(By.TAG_NAME, "iframe")
-        self.step_log.info("Scanning %s iframe(s) for target element", len(iframes))
-        for idx, frame in enumerate(iframes):
-            self.switch_to_default_content()
+        self.switch_to_default_content()
+        paths = fmap.frame_paths(self.driver)
+        el = self._scan_frames(fmap, key, locators, paths, timeout_per_iframe)
+        if el is not None:
+            return el
+
+        # frames injected later in the same page load (e.g. a late dialog): re-list once and retry
+        self.switch_to_default_content()
+        fresh = fmap.frame_paths(self.driver, refresh=True)
+        if fresh != paths:
+            el = self._scan_frames(fmap, key, locators, fresh, timeout_per_iframe)
+            if el is not None:
+                return el
+
+        self.switch_to_default_content()
+        raise TimeoutException(f"Element not found in default content or any iframe: {locators}")
+
+    def _scan_frames(self, fmap, key: tuple, locators: List[Tuple[By, str]], paths, timeout_per_iframe: int):
+        self.step_log.info("Scanning %s iframe(s) for target element", len(paths))
+        for path in paths:
             try:
-                self.driver.switch_to.frame(frame)
-                self.debug_log.debug("Switched to iframe #%s", idx)
+                switch_to_path(self.driver, path)
+                self.debug_log.debug("Switched to iframe %s", path)
                 el = self.try_find_any(locators, timeout=timeout_per_iframe)
-                self.step_log.info("Found element inside iframe #%s", idx)
+                self.step_log.info("Found element inside iframe %s", path)
+                fmap.memo[key] = path
                 return el
             except Exception as e:
-                self.debug_log.debug("Not in iframe #%s (%s)", idx, e)
+                self.debug_log.debug("Not in iframe %s (%s)", path, e)
                 continue
+        return None
 
-        self.switch_to_default_content()
-        raise TimeoutException(f"Element not found in default content or any iframe: {locators}")
     # ADD to BasePage (inside the class)
+    @traced()
     def safe_refresh(self, wait_seconds: int = 1):
         self.step_log.info("[DEBUG] Refreshing page")
         self.driver.refresh()
         try:
-            WebDriverWait(self.driver, wait_seconds).until(lambda d: True)
+            PollingWait(self.driver, wait_seconds).until(lambda d: True)
         except Exception:
             pass
 
+    @traced()
     def element_exists(self, locators: List[Tuple[By, str]], timeout: int = 3) -> bool:
         try:
             self.try_find_any(locators, timeout=timeout)
@@ -140,6 +420,7 @@ class BasePage:
         self.step_log.info("[DEBUG] Scrolling to bottom")
         self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
 
+    @traced()
     def smart_click_many(self, locator_sets: List[List[Tuple[By, str]]], timeout_each: int = 4) -> bool:
         """
         Try groups of locators until one clicks. Returns True on first success.
@@ -1,7 +1,6 @@
 from selenium.webdriver.common.by import By
 from .base_page import BasePage
 from logger_utils import log_step
-import time
 
 
 class FinancePage(BasePage):
@@ -61,8 +60,10 @@ class FinancePage(BasePage):
         search_box.clear()
         search_box.send_keys(ticket_id)
 
+        self.start_dom_watch()
         self.safe_click(self.SEARCH_BUTTON)
-        time.sleep(2)
+        self.wait_for_network_idle(idle_ms=300, timeout=15, expect_request=2)
+        self.wait_for_dom_settled(quiet_ms=400, timeout=8, require_change=True)
 
         # Take screenshot for evidence
         screenshot_path = f"logs/screenshots/finance_{ticket_id}.png"
@@ -1,19 +1,42 @@
 # pages/finance_table_page.py
 import os
-import time
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Iterator, Optional
 
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
 
 from .base_page import BasePage
 from logger_utils import log_step
+from utils.table_extract import parse_money, pick_table, read_tables
+from utils.table_paging import iter_table_rows
+
+
+@dataclass
+class PaymentHistoryRow:
+    """One visible row of the Finance 'Payment History' table."""
+    ticket_number: str
+    date: str
+    ticket_status: str
+    original_fine: Optional[Decimal]
+    amount_paid: Optional[Decimal]
+    amount_owed: Optional[Decimal]
+    payment_status: str
+
+    def as_log_line(self) -> str:
+        def money(v):
+            return "" if v is None else str(v)
+        return (f"{self.ticket_number} | {self.date} | {self.ticket_status} | {money(self.original_fine)} | "
+                f"{money(self.amount_paid)} | {money(self.amount_owed)} | {self.payment_status}")
 
 
 class FinanceTablePage(BasePage):
     """
     Utilities for reading the Finance 'Payment History' table (UI only).
-    This reads the FIRST ROW using the exact selectors you provided and
-    appends a formatted line to logs/tabel_log/<log_name>.
+    log_first_row reads the FIRST ROW using the exact selectors you provided;
+    iter_payment_history reads every visible row by header name.
+    Both append formatted lines to logs/tabel_log/<log_name>.
     """
 
     # ---- (optional) quick filter controls on the Finance page ----
@@ -49,6 +72,34 @@ class FinanceTablePage(BasePage):
     _STATUS_UNPAID = [(By.XPATH, "//span[@class='label label-danger']")]
     _STATUS_GENERIC_COL11 = [(By.XPATH, "//tbody/tr[1]/td[11]/span[1]")]  # e.g. "void"
 
+    # status probes, answered together with the row cells in one read_many call
+    _STATUS_QUERIES = {
+        "paid_by_cash": {"locators": _STATUS_PAID_BY_CASH, "read": "exists"},
+        "unpaid": {"locators": _STATUS_UNPAID, "read": "exists"},
+        "status_col11": _STATUS_GENERIC_COL11,
+    }
+    _ROW_QUERIES = {
+        "ticket_number": _TICKET_NUMBER,
+        "date": _DATE,
+        "ticket_status": _TICKET_STATUS,
+        "original_fine": _ORIGINAL_FINE,
+        "amount_paid": _AMOUNT_PAID,
+        "amount_owed": _AMOUNT_OWED,
+        **_STATUS_QUERIES,
+    }
+
+    # Payment History columns by header text (normalized, lower-case)
+    _HISTORY_COLUMNS = {
+        "ticket_number": ["ticket number", "ticket #", "ticket no", "citation number", "ticket"],
+        "date": ["date", "payment date"],
+        "ticket_status": ["ticket status"],
+        "original_fine": ["original fine", "fine"],
+        "amount_paid": ["amount paid", "paid"],
+        "amount_owed": ["amount owed", "owed", "balance"],
+        "payment_status": ["payment status", "status"],
+    }
+    _HISTORY_REQUIRED = ["ticket_number", "amount_paid"]
+
     # ---- helpers ----
     def _ensure_table_log_dir(self):
         os.makedirs(os.path.join("logs", "tabel_log"), exist_ok=True)
@@ -60,14 +111,15 @@ class FinanceTablePage(BasePage):
         except Exception:
             return ""
 
-    def _read_payment_status(self) -> str:
-        if self.element_exists(self._STATUS_PAID_BY_CASH, timeout=1):
+    def _read_payment_status(self, values: dict = None) -> str:
+        if values is None:
+            values = self.read_many(self._STATUS_QUERIES)
+        if values.get("paid_by_cash"):
             return "paid by cash"
-        if self.element_exists(self._STATUS_UNPAID, timeout=1):
+        if values.get("unpaid"):
             return "unpaid"
         # Fallback: whatever label is in col 11 (often "void")
-        val = self._text_or_blank(self._STATUS_GENERIC_COL11, timeout=1)
-        return val or ""
+        return values.get("status_col11") or ""
 
     # ---- public API ----
     @log_step("Apply Finance table filter (optional)")
@@ -82,8 +134,9 @@ class FinanceTablePage(BasePage):
             # harmless if not present
             self.debug_log.debug("Local checkbox missing or already selected.")
 
-        # Type ticket and search
+        # Type ticket and search; watch first, a live filter may redraw while typing
         box = self.try_find_any(self._FILTER_SEARCH_INPUT, timeout=10)
+        self.start_dom_watch()
         box.clear()
         box.send_keys(ticket_id)
 
@@ -93,8 +146,9 @@ class FinanceTablePage(BasePage):
             # some UIs filter instantly without button
             self.debug_log.debug("Search button not clickable; relying on live filtering.")
 
-        # small pause for table redraw
-        time.sleep(0.7)
+        # wait for the search request, then for the table redraw to finish
+        self.wait_for_network_idle(idle_ms=300, timeout=15)
+        self.wait_for_dom_settled(quiet_ms=300, timeout=5, require_change=True)
 
     @log_step("Read first row from Finance table and append log line")
     def log_first_row(self, log_name: str = "finance_table.log"):
@@ -107,13 +161,17 @@ class FinanceTablePage(BasePage):
         """
         self._ensure_table_log_dir()
 
-        ticket_number = self._text_or_blank(self._TICKET_NUMBER)
-        date = self._text_or_blank(self._DATE)
-        ticket_status = self._text_or_blank(self._TICKET_STATUS)
-        original_fine = self._text_or_blank(self._ORIGINAL_FINE)
-        amount_paid = self._text_or_blank(self._AMOUNT_PAID)
-        amount_owed = self._text_or_blank(self._AMOUNT_OWED)
-        payment_status = self._read_payment_status()
+        # wait once for the row, then read every cell + status in a single round trip
+        self.element_exists(self._TICKET_NUMBER + self._DATE, timeout=5)
+        values = self.read_many(self._ROW_QUERIES)
+
+        ticket_number = values.get("ticket_number") or ""
+        date = values.get("date") or ""
+        ticket_status = values.get("ticket_status") or ""
+        original_fine = values.get("original_fine") or ""
+        amount_paid = values.get("amount_paid") or ""
+        amount_owed = values.get("amount_owed") or ""
+        payment_status = self._read_payment_status(values)
 
         line = f"{ticket_number} | {date} | {ticket_status} | {original_fine} | {amount_paid} | {amount_owed} | {payment_status}"
 
@@ -125,3 +183,60 @@ class FinanceTablePage(BasePage):
         self.step_log.info(f"[TABLE] {line}")
 
         return line, path
+
+    def iter_payment_history(self) -> Iterator[PaymentHistoryRow]:
+        """
+        Every visible row of the Payment History table, located by its header names
+        (no positional selectors) and read in a single execute_script.
+        """
+        table, cols = pick_table(read_tables(self.driver), self._HISTORY_COLUMNS, self._HISTORY_REQUIRED)
+        if table is None:
+            self.debug_log.debug("Payment History table not found (no table with %s headers)", self._HISTORY_REQUIRED)
+            return
+        self.debug_log.debug("Payment History table #%s columns=%s rows=%s", table["index"], cols, len(table["rows"]))
+
+        for row in table["rows"]:
+            yield self._history_row(cols, row["cells"])
+
+    def iter_all_payment_history(self, until=None, prefetch: bool = True) -> Iterator[PaymentHistoryRow]:
+        """Like iter_payment_history, but walks every page of the table lazily (one page in memory)."""
+        found = {}
+
+        def choose(tables):
+            table, cols = pick_table(tables, self._HISTORY_COLUMNS, self._HISTORY_REQUIRED)
+            found["cols"] = cols
+            return table
+
+        stop = (lambda r: until(self._history_row(found["cols"], r.cells))) if until else None
+        for row in iter_table_rows(self, "table", prefetch=prefetch, until=stop, choose=choose):
+            yield self._history_row(found["cols"], row.cells)
+
+    @staticmethod
+    def _history_row(cols: dict, cells: list) -> PaymentHistoryRow:
+        def cell(field):
+            idx = cols.get(field)
+            return cells[idx] if idx is not None and idx < len(cells) else ""
+
+        return PaymentHistoryRow(
+            ticket_number=cell("ticket_number"),
+            date=cell("date"),
+            ticket_status=cell("ticket_status"),
+            original_fine=parse_money(cell("original_fine")),
+            amount_paid=parse_money(cell("amount_paid")),
+            amount_owed=parse_money(cell("amount_owed")),
+            payment_status=cell("payment_status"),
+        )
+
+    @log_step("Read all Finance table rows and append log lines")
+    def log_all_rows(self, log_name: str = "finance_table_all.log"):
+        """Appends one line per visible Payment History row. Returns (rows, file_path)."""
+        self._ensure_table_log_dir()
+        rows = list(self.iter_payment_history())
+
+        path = os.path.join("logs", "tabel_log", log_name)
+        with open(path, "a", encoding="utf-8") as f:
+            for row in rows:
+                f.write(row.as_log_line() + "\n")
+
+        self.step_log.info(f"[TABLE] {len(rows)} row(s) logged to {path}")
+        return rows, path
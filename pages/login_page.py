@@ -1,16 +1,43 @@
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from .base_page import BasePage
+from utils.session_cache import get_session_cache
+from utils.waits import PollingWait
 
 class LoginPage(BasePage):
+    # Present only when logged in (validity probe for a restored session)
+    APP_MARKERS = [
+        (By.XPATH, "//li[@id='data_nav']"),
+        (By.XPATH, "//a[@id='navbar_toggle_anchor']"),
+        (By.XPATH, "//i[@class='fa fa-database']"),
+    ]
+    LOGIN_FORM = [(By.ID, 'username'), (By.ID, 'loginButton')]
+
     def __init__(self, driver, base_url, wait: int = 20):
         self.driver = driver
+        self.tenant_url = base_url.rstrip('/') + '/'
         self.base_url = base_url.rstrip('/') + '/default/index'
         super().__init__(driver, wait)
-        self.wait = WebDriverWait(driver, wait)
+        self.wait = PollingWait(driver, wait)
+        self.session_cache = get_session_cache()
+
+    def _session_valid(self, timeout: int = 8) -> bool:
+        """Restored session is usable if the app chrome shows up and we did not land on the login form."""
+        try:
+            _, idx = self.find_first_match(self.APP_MARKERS + self.LOGIN_FORM, timeout=timeout)
+        except Exception:
+            return False
+        return idx < len(self.APP_MARKERS)
+
+    def open_and_login(self, username: str, password: str, use_session_cache: bool = True):
+        # Reuse a cached authenticated session; only fall back to the form if the probe fails
+        if use_session_cache and self.session_cache.restore(self.driver, self.tenant_url, username):
+            if self._session_valid():
+                self.step_log.info("[DEBUG] Reused cached session for %s", username)
+                return
+            self.debug_log.debug("Cached session rejected; logging in with the form.")
+            self.session_cache.drop(self.tenant_url, username)
 
-    def open_and_login(self, username: str, password: str):
         self.driver.get(self.base_url)
 
         username_locators = [
@@ -45,3 +72,11 @@ class LoginPage(BasePage):
             self.switch_to_last_window(timeout=10)
         except Exception:
             self.debug_log.debug("No new window detected after DB icon.")
+
+        if use_session_cache:
+            # snapshot once the app page has loaded, so its storage is populated
+            try:
+                self.wait_for_page_ready()
+            except Exception:
+                pass
+            self.session_cache.save(self.driver, self.tenant_url, username)
@@ -131,41 +131,12 @@ class PaymentPage(BasePage):
             modal = None  # likely SweetAlert or auto-submit
 
         if modal:
-            # Modal path: click Confirm (with JS fallback) and wait to close
-            try:
-                btn = self.try_find_any(self.CONFIRM_AFTER_SUBMIT, timeout=6)
-            except Exception:
-                btn = self.try_find_in_any_iframe(self.CONFIRM_AFTER_SUBMIT, timeout_per_iframe=3)
-            self._scroll_into_view(btn)
-            try:
-                btn.click()
-            except Exception:
-                self._js_click(btn)
-
-            try:
-                self.wait.until(EC.invisibility_of_element(modal))
-            except Exception:
-                pass
-            # Sometimes there's an explicit close button afterward
-            try:
-                close = self.try_find_any(self.CLOSE_MODAL, timeout=3)
-                self._scroll_into_view(close)
-                try:
-                    close.click()
-                except Exception:
-                    self._js_click(close)
-            except Exception:
-                pass
+            self.confirm_submit_modal(modal)
         else:
             # No modal path: wait for success signal or the submit button to change
             # Try a few different success indicators
             try:
-                for loc in self.SUCCESS_MARKERS:
-                    try:
-                        self.try_find_any([loc], timeout=3)
-                        break
-                    except Exception:
-                        continue
+                self.try_find_any(self.SUCCESS_MARKERS, timeout=3)
             except Exception:
                 pass
             # Also accept that the submit button becomes disabled or hidden
@@ -175,6 +146,34 @@ class PaymentPage(BasePage):
             except Exception:
                 pass
 
+    def confirm_submit_modal(self, modal):
+        """Click Confirm in the post-submit modal, wait for it to close, then dismiss any close button."""
+        # Modal path: click Confirm (with JS fallback) and wait to close
+        try:
+            btn = self.try_find_any(self.CONFIRM_AFTER_SUBMIT, timeout=6)
+        except Exception:
+            btn = self.try_find_in_any_iframe(self.CONFIRM_AFTER_SUBMIT, timeout_per_iframe=3)
+        self._scroll_into_view(btn)
+        try:
+            btn.click()
+        except Exception:
+            self._js_click(btn)
+
+        try:
+            self.wait.until(EC.invisibility_of_element(modal))
+        except Exception:
+            pass
+        # Sometimes there's an explicit close button afterward
+        try:
+            close = self.try_find_any(self.CLOSE_MODAL, timeout=3)
+            self._scroll_into_view(close)
+            try:
+                close.click()
+            except Exception:
+                self._js_click(close)
+        except Exception:
+            pass
+
     @log_step("Close 'Payment submitted' dialog")
     def handle_payment_submitted_ok(self, timeout: int = 12):
         """
@@ -184,21 +183,17 @@ class PaymentPage(BasePage):
         dlg = None
         end = time.time() + timeout
         while time.time() < end and dlg is None:
-            # default content
-            for loc in self.PAYMENT_DIALOG_ANY:
+            # default content (all dialog variants polled together)
+            try:
+                dlg = self.try_find_any(self.PAYMENT_DIALOG_ANY, timeout=2)
+            except Exception:
+                pass
+            # any iframe
+            if dlg is None:
                 try:
-                    dlg = self.try_find_any([loc], timeout=2)
-                    break
+                    dlg = self.try_find_in_any_iframe(self.PAYMENT_DIALOG_ANY, timeout_per_iframe=2)
                 except Exception:
                     pass
-            # any iframe
-            if dlg is None:
-                for loc in self.PAYMENT_DIALOG_ANY:
-                    try:
-                        dlg = self.try_find_in_any_iframe([loc], timeout_per_iframe=2)
-                        break
-                    except Exception:
-                        pass
             if dlg is None:
                 time.sleep(0.2)
 
@@ -209,15 +204,11 @@ class PaymentPage(BasePage):
         self._scroll_into_view(dlg)
 
         ok_btn = None
-        for loc in self.PAYMENT_OK_ANY:
-            try:
-                ok_btn = self.try_find_any([loc], timeout=2)
-                break
-            except Exception:
-                pass
+        try:
+            ok_btn = self.try_find_any(self.PAYMENT_OK_ANY, timeout=2)
+        except Exception:
             try:
-                ok_btn = self.try_find_in_any_iframe([loc], timeout_per_iframe=2)
-                break
+                ok_btn = self.try_find_in_any_iframe(self.PAYMENT_OK_ANY, timeout_per_iframe=2)
             except Exception:
                 pass
 
@@ -258,40 +249,36 @@ class PaymentPage(BasePage):
 
         # Click any visible 'void' candidate (default content first)
         clicked = False
-        for by, sel in self.VOID_BUTTONS:
+        try:
+            btn = self.try_find_any(self.VOID_BUTTONS, timeout=3)
+            self._scroll_into_view(btn)
             try:
-                btn = self.try_find_any([(by, sel)], timeout=3)
+                btn.click()
+            except Exception:
+                self._js_click(btn)
+            clicked = True
+        except Exception:
+            pass
+
+        # Try inside iframes if needed
+        if not clicked:
+            try:
+                btn = self.try_find_in_any_iframe(self.VOID_BUTTONS, timeout_per_iframe=2)
                 self._scroll_into_view(btn)
                 try:
                     btn.click()
                 except Exception:
                     self._js_click(btn)
                 clicked = True
-                break
             except Exception:
-                continue
-
-        # Try inside iframes if needed
-        if not clicked:
-            for by, sel in self.VOID_BUTTONS:
-                try:
-                    btn = self.try_find_in_any_iframe([(by, sel)], timeout_per_iframe=2)
-                    self._scroll_into_view(btn)
-                    try:
-                        btn.click()
-                    except Exception:
-                        self._js_click(btn)
-                    clicked = True
-                    break
-                except Exception:
-                    continue
+                pass
 
         if not clicked:
             raise AssertionError("Void button not found on Payment page")
 
         # now the reason input and confirm should be visible (often in a modal)
-        # give the UI a tiny beat to render
-        time.sleep(0.25)
+        # let the modal finish rendering
+        self.wait_for_dom_settled(quiet_ms=150, timeout=3)
 
         # type reason (allow JS fallback if not interactable)
         try:
@@ -305,6 +292,7 @@ class PaymentPage(BasePage):
             self._js_set_value(el, reason)
 
         # click confirm
+        self.start_dom_watch()
         try:
             self.safe_click(self.CONFIRM_VOID)
         except Exception:
@@ -314,5 +302,5 @@ class PaymentPage(BasePage):
                 el = self.try_find_in_any_iframe(self.CONFIRM_VOID, timeout_per_iframe=2)
             self._js_click(el)
 
-        # small wait so the row updates/vanishes
-        time.sleep(0.5)
+        # wait for the row to update/vanish
+        self.wait_for_dom_settled(quiet_ms=250, timeout=5, require_change=True)
@@ -2,13 +2,18 @@
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException
 from .base_page import BasePage
 from logger_utils import log_step
+from utils.table_paging import iter_table_rows
+from utils.results_index import results_index_for
 
 class SearchPage(BasePage):
     DATE_RANGE = [(By.ID, "filter-date_range")]
     SERIAL_INPUT = [(By.ID, "filter-serial_number")]
     PRIMARY_SEARCH_BTN = [(By.ID, "btn-search-primary")]
+    RESULTS_TABLE_CSS = "table"  # first visible table with rows is the results grid
+    RESULT_ROWS = [(By.CSS_SELECTOR, "table tbody tr[id]")]  # any rendered result row
 
     def _row_by_ticket(self, ticket_id: str):
         # Your table row id is the ticket id itself: <tr id="P4003300">
@@ -18,6 +23,21 @@ class SearchPage(BasePage):
         # From your XPath: //tr[@id='P4003300']/td[8]/div/div[2]/span
         return [(By.XPATH, f"//tr[@id='{ticket_id}']/td[8]//div/div[2]/span")]
 
+    # same dropdown, relative to an indexed row handle
+    ROW_ACTION_DROPDOWN_REL = (By.XPATH, "./td[8]//div/div[2]/span")
+
+    # ---- results index (ticket_id → row handle + status badges) ----
+    def results_index(self):
+        """Index of the rendered results; rebuilt in one pass only after the table redraws."""
+        return results_index_for(self.driver, self.RESULTS_TABLE_CSS)
+
+    def indexed_row(self, ticket_id: str):
+        return self.results_index().get(ticket_id)
+
+    def ticket_has_status(self, ticket_id: str, status: str) -> bool:
+        row = self.indexed_row(ticket_id)
+        return bool(row and row.has_status(status))
+
     PAYMENT_LINK = [
         (By.LINK_TEXT, "Payment"),
         (By.XPATH, "//a[normalize-space()='Payment']"),
@@ -43,10 +63,46 @@ class SearchPage(BasePage):
             else:
                 raise
 
+        # results are loaded once the search request(s) have finished
+        self.wait_for_network_idle(idle_ms=300, timeout=20, expect_request=2)
+
+    def iter_result_rows(self, prefetch: bool = True, until=None, mode: str = "pages"):
+        """Lazily walk every page of the search results (see utils.table_paging.iter_table_rows)."""
+        return iter_table_rows(self, self.RESULTS_TABLE_CSS, mode=mode, prefetch=prefetch, until=until)
+
+    @log_step("Page through results to ticket row")
+    def find_ticket_row(self, ticket_id: str) -> bool:
+        """Page forward until the ticket's row is rendered; leaves that page displayed."""
+        for row in self.iter_result_rows(prefetch=False, until=lambda r: r.row_id == ticket_id):
+            if row.row_id == ticket_id:
+                return True
+        return False
+
     @log_step("Open ticket row")
     def open_ticket_actions(self, ticket_id: str):
-        # Wait for row to be present
-        self.try_find_any(self._row_by_ticket(ticket_id), timeout=20)
+        # Fast path: row already in the results index → click its dropdown via the row handle
+        row = self.indexed_row(ticket_id)
+        if row is not None:
+            try:
+                el = row.element.find_element(*self.ROW_ACTION_DROPDOWN_REL)
+                self._scroll_into_view(el)
+                try:
+                    el.click()
+                except Exception:
+                    self._js_click(el)
+                return
+            except Exception as e:
+                self.debug_log.debug("Indexed row for %s unusable (%s); falling back", ticket_id, e)
+
+        # Wait (full timeout) until the ticket row OR any result row is rendered; only when the
+        # results are in and the ticket is not among them, walk the other result pages
+        row_locators = self._row_by_ticket(ticket_id)
+        try:
+            _, idx = self.find_first_match(row_locators + self.RESULT_ROWS, timeout=20)
+        except TimeoutException:
+            raise TimeoutException(f"No search results rendered while looking for ticket {ticket_id}")
+        if idx >= len(row_locators) and not self.find_ticket_row(ticket_id):
+            raise TimeoutException(f"Ticket row {ticket_id} not found on any results page")
         # Open row action dropdown
         self.safe_click(self._row_action_dropdown(ticket_id))
 
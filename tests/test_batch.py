@@ -0,0 +1,46 @@
+# tests/test_batch.py
+import json
+import os
+import pytest
+from flows.batch import iter_tickets, run_batch, run_batch_in_tabs
+from logger_utils import get_result_logger
+
+res_log = get_result_logger()
+
+CLIENT_FILES = {
+    "payment": os.path.join("data", "ledger_client_data.json"),
+    "adjustment": os.path.join("data", "adjustment_data.json"),
+}
+
+
+@pytest.fixture
+def batch_file(request):
+    path = request.config.getoption("--batch-file")
+    if not path:
+        pytest.skip("no --batch-file / LEDGER_BATCH_FILE given")
+    return path
+
+
+def test_batch_flow(batch_file, driver, request):
+    """
+    Run --batch-flow over every ticket in --batch-file in ONE logged-in session:
+        python -m pytest -q tests/test_batch.py --batch-file tickets.csv --batch-flow adjustment -s
+    Add --batch-tabs 3 to interleave tickets across three tabs of the same browser.
+    Per-ticket outcomes go to logs/batch_<flow>.jsonl.
+    """
+    flow = request.config.getoption("--batch-flow")
+
+    with open(CLIENT_FILES[flow], "r", encoding="utf-8") as f:
+        client = json.load(f)["clients"][0]
+
+    tabs = request.config.getoption("--batch-tabs")
+    if tabs > 1:
+        report = run_batch_in_tabs(driver, client, iter_tickets(batch_file), flow=flow, tabs=tabs)
+    else:
+        report = run_batch(driver, client, iter_tickets(batch_file), flow=flow)
+    report.write_jsonl(os.path.join("logs", f"batch_{flow}.jsonl"))
+    res_log.info("TEST: %s", report.summary())
+
+    assert report.outcomes, f"No tickets read from {batch_file}"
+    failed = [o.ticket_id for o in report.outcomes if not o.ok]
+    assert not failed, f"{len(failed)} ticket(s) failed: {failed}"
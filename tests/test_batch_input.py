@@ -0,0 +1,22 @@
+# tests/test_batch_input.py
+# flows.batch — no browser needed: python -m pytest -q tests/test_batch_input.py
+from flows.batch import iter_tickets
+
+
+def test_iter_tickets_csv_skips_rows_without_ticket_id(tmp_path):
+    path = tmp_path / "tickets.csv"
+    path.write_text("ticket_id,amount\n T-1 , 5\n,6\nT-2,\n", encoding="utf-8")
+    assert list(iter_tickets(str(path))) == [{"ticket_id": "T-1", "amount": "5"}, {"ticket_id": "T-2", "amount": ""}]
+
+
+def test_iter_tickets_jsonl_skips_bad_lines(tmp_path):
+    path = tmp_path / "tickets.jsonl"
+    path.write_text('{"ticket_id": 12, "reason": "x"}\n\n{"amount": 3}\nnot json\n[1]\n{"ticket_id": "T-9"}\n',
+                    encoding="utf-8")
+    assert list(iter_tickets(str(path))) == [{"ticket_id": "12", "reason": "x"}, {"ticket_id": "T-9"}]
+
+
+def test_iter_tickets_text_ignores_comments_and_blanks(tmp_path):
+    path = tmp_path / "tickets.txt"
+    path.write_text("# batch\nT-1\n\n  T-2  \n", encoding="utf-8")
+    assert list(iter_tickets(str(path))) == [{"ticket_id": "T-1"}, {"ticket_id": "T-2"}]
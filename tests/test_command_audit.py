@@ -0,0 +1,41 @@
+# tests/test_command_audit.py
+# utils.command_audit — no browser needed: python -m pytest -q tests/test_command_audit.py
+from utils.command_audit import CommandAudit, polling
+
+SCRIPT = {"script": "return findFirst(arguments[0]);", "args": [[["id", "submit"]]]}
+
+
+def _repeats(audit, frame):
+    return [issue for issue in audit.problems(frame) if "round-trips" not in issue]
+
+
+def test_same_script_and_args_is_a_repeat():
+    audit = CommandAudit(budget=100, repeat_limit=2)
+    with audit.step("scripts") as frame:
+        for _ in range(3):
+            audit.record("w3cExecuteScript", SCRIPT, 0.01)
+        audit.record("w3cExecuteScript", dict(SCRIPT, args=[[["id", "other"]]]), 0.01)
+    issues = _repeats(audit, frame)
+    assert len(issues) == 1 and issues[0].startswith("3x w3cExecuteScript")
+
+
+def test_polls_inside_a_wait_are_counted_but_not_repeats():
+    audit = CommandAudit(budget=100, repeat_limit=2)
+    with audit.step("wait") as frame:
+        with polling():
+            for _ in range(10):
+                audit.record("w3cExecuteScript", SCRIPT, 0.01)
+                audit.record("findElement", {"using": "css selector", "value": "#ok"}, 0.01)
+    assert frame.count == 20
+    assert _repeats(audit, frame) == []
+
+
+def test_frame_count_probe_is_not_a_repeat():
+    audit = CommandAudit(budget=100, repeat_limit=1)
+    with audit.step("frames") as frame:
+        for _ in range(5):
+            audit.record("findElements", {"using": "css selector", "value": "iframe, frame"}, 0.01)
+        for _ in range(2):
+            audit.record("findElements", {"using": "xpath", "value": "//tr"}, 0.01)
+    assert _repeats(audit, frame) == ["2x findElements xpath=//tr"]
+    assert audit.report()[0]["repeated_find"] == 1
@@ -0,0 +1,49 @@
+# tests/test_driver_resolver.py
+# utils.driver_resolver cache — no browser or network needed: python -m pytest -q tests/test_driver_resolver.py
+import os
+import stat
+import sys
+
+import pytest
+
+from utils import driver_resolver
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(driver_resolver, "CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setattr(driver_resolver, "INDEX_PATH", str(tmp_path / "cache" / "index.json"))
+    monkeypatch.setenv(driver_resolver.OFFLINE_ENV, "1")
+    driver_resolver.resolve_chromedriver.cache_clear()
+    yield tmp_path
+    driver_resolver.resolve_chromedriver.cache_clear()
+
+
+def _fake_driver(tmp_path, version="120.0.6099.109"):
+    path = tmp_path / "chromedriver"
+    path.write_text(f"#!{sys.executable}\nprint('ChromeDriver {version} (abc)')\n", encoding="utf-8")
+    path.chmod(path.stat().st_mode | stat.S_IEXEC)
+    return str(path)
+
+
+@pytest.mark.skipif(os.name != "posix", reason="fake driver is a shebang script")
+def test_configured_driver_is_reused_when_chrome_is_undetectable(cache, monkeypatch):
+    monkeypatch.setattr(driver_resolver, "detect_chrome_version", lambda index=None: None)
+    monkeypatch.setenv(driver_resolver.LOCAL_DRIVER_ENV, _fake_driver(cache))
+    first = driver_resolver.resolve_chromedriver()
+    assert first.startswith(driver_resolver.CACHE_DIR)
+
+    index = driver_resolver._load_index()
+    assert index["drivers"]["120"]["path"] == first  # keyed by the driver's own version
+    assert index["last"]["path"] == first
+
+    monkeypatch.delenv(driver_resolver.LOCAL_DRIVER_ENV)
+    driver_resolver.resolve_chromedriver.cache_clear()
+    assert driver_resolver.resolve_chromedriver() == first
+
+
+def test_nothing_found_offline_raises(cache, monkeypatch):
+    monkeypatch.setattr(driver_resolver, "detect_chrome_version", lambda index=None: None)
+    monkeypatch.delenv(driver_resolver.LOCAL_DRIVER_ENV, raising=False)
+    with pytest.raises(RuntimeError):
+        driver_resolver.resolve_chromedriver()
@@ -27,3 +27,24 @@ def test_finance_table_log_first_row(driver, clients_data):
 
     # 4) Simple sanity check
     assert ticket in line, f"Ticket '{ticket}' not found in logged line: {line}"
+
+
+def test_finance_table_log_all_rows(driver, clients_data):
+    """
+    Same filter as above, but read EVERY visible Payment History row (by header name)
+    and append one line per row to logs/tabel_log/finance_table_all.log.
+    """
+    client = clients_data[0]
+    ticket = client["ticket_id"]
+
+    LoginPage(driver, client["base_url"]).open_and_login(
+        client["username"], client["password"]
+    )
+    NavBar(driver).go_to_finance_with_fallback(client["base_url"])
+
+    table = FinanceTablePage(driver)
+    table.apply_filter(ticket_id=ticket, ensure_local=True)
+    rows, path = table.log_all_rows(log_name="finance_table_all.log")
+
+    assert rows, "Payment History table returned no rows"
+    assert any(r.ticket_number == ticket for r in rows), f"Ticket '{ticket}' not in rows logged to {path}"
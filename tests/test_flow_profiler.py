@@ -0,0 +1,36 @@
+# tests/test_flow_profiler.py
+# utils.flow_profiler — no browser needed: python -m pytest -q tests/test_flow_profiler.py
+import sys
+
+from logger_utils import log_step
+from utils.flow_profiler import NO_STEP, _collapse
+
+
+def _leaf():
+    return sys._getframe()
+
+
+@log_step("profiler outer")
+def _outer_step():
+    return _inner_step()
+
+
+@log_step("profiler inner")
+def _inner_step():
+    return _leaf()
+
+
+def test_collapse_roots_stack_at_outermost_step():
+    stack = _collapse(_outer_step(), keep_unstepped=False)
+    parts = stack.split(";")
+    assert parts[0] == "step:profiler outer"
+    assert "step:profiler inner" in parts
+    assert parts[-1].startswith("_leaf (test_flow_profiler.py:")
+
+
+def test_collapse_without_step():
+    frame = _leaf()
+    assert _collapse(frame, keep_unstepped=False) is None
+    stack = _collapse(frame, keep_unstepped=True)
+    assert stack.split(";")[0] == NO_STEP
+    assert stack.endswith(";" + f"_leaf (test_flow_profiler.py:{_leaf.__code__.co_firstlineno})")
@@ -0,0 +1,44 @@
+# tests/test_multi_tenant.py
+# flows.multi_tenant — no browser needed: python -m pytest -q tests/test_multi_tenant.py
+import pytest
+
+from flows.multi_tenant import _on_tenant, build_units, main, run_all_tenants
+
+
+def test_build_units_splits_tickets_per_tenant():
+    a = {"base_url": "https://host/a/", "tickets": ["1", "2", {"ticket_id": "3", "amount": "5"}]}
+    b = {"base_url": "https://host/b/", "ticket_id": "9"}
+    units = build_units([a, b], per_tenant=2)
+    assert [(client["base_url"], [t["ticket_id"] for t in tickets]) for client, tickets in units] == [
+        ("https://host/a/", ["1", "3"]),
+        ("https://host/a/", ["2"]),
+        ("https://host/b/", ["9"]),
+    ]
+    assert units[0][1][1] == {"ticket_id": "3", "amount": "5"}
+
+
+def test_build_units_never_makes_empty_units():
+    units = build_units([{"base_url": "https://host/a/", "tickets": ["1"]}], per_tenant=4)
+    assert len(units) == 1
+
+
+@pytest.mark.parametrize("kwargs", [{"per_tenant": 0}, {"per_tenant": -1}, {"workers": 0}])
+def test_run_all_tenants_rejects_caps_below_one(kwargs):
+    with pytest.raises(ValueError):
+        run_all_tenants([{"base_url": "https://host/a/", "ticket_id": "1"}], **kwargs)
+
+
+def test_cli_rejects_per_tenant_below_one():
+    with pytest.raises(SystemExit):
+        main(["--per-tenant", "0"])
+
+
+class _Driver:
+    def __init__(self, url):
+        self.current_url = url
+
+
+def test_on_tenant_compares_the_tenant_path():
+    assert _on_tenant(_Driver("https://host/a/default/index"), "https://host/a/")
+    assert not _on_tenant(_Driver("https://host/ab/default/index"), "https://host/a")
+    assert not _on_tenant(_Driver("https://host/b/"), "https://host/a/")
@@ -0,0 +1,34 @@
+# tests/test_session_cache.py
+# utils.session_cache key file — no browser needed: python -m pytest -q tests/test_session_cache.py
+import base64
+import os
+import threading
+
+from utils import session_cache
+
+
+class _KeyGen:
+    @staticmethod
+    def generate_key():
+        return base64.urlsafe_b64encode(os.urandom(32))
+
+
+def test_concurrent_first_use_agrees_on_one_complete_key(tmp_path, monkeypatch):
+    monkeypatch.setattr(session_cache, "Fernet", _KeyGen)
+    key_path = str(tmp_path / "sessions" / "session.key")
+    start, keys = threading.Barrier(8), []
+
+    def worker():
+        start.wait()
+        keys.append(session_cache._read_or_create_key(key_path))
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(keys) == 8 and len(set(keys)) == 1 and len(keys[0]) == 44
+    assert os.listdir(tmp_path / "sessions") == ["session.key"]  # no temp files left behind
+    if os.name == "posix":
+        assert os.stat(key_path).st_mode & 0o777 == 0o600
@@ -0,0 +1,41 @@
+# tests/test_step_metrics.py
+# utils.step_metrics — no browser needed: python -m pytest -q tests/test_step_metrics.py
+import pytest
+
+from logger_utils import _step_tenant, tenant_scope
+from utils.step_metrics import StepMetrics, percentile
+
+
+@pytest.mark.parametrize("pct, expected", [(0, 1), (50, 5), (95, 10), (99, 10), (100, 10)])
+def test_percentile_nearest_rank(pct, expected):
+    assert percentile([float(v) for v in range(1, 11)], pct) == expected
+
+
+def test_percentile_of_nothing_is_zero():
+    assert percentile([], 95) == 0.0
+
+
+def test_report_aggregates_per_step_tenant_and_outcome():
+    metrics = StepMetrics()
+    for seconds in (0.1, 0.2, 0.3):
+        metrics.record("Submit payment", "https://host/a/", "PASS", seconds)
+    metrics.record("Submit payment", "https://host/a/", "FAIL", 2.0)
+    rows = {(r["tenant"], r["outcome"]): r for r in metrics.report()}
+    assert rows[("https://host/a/", "PASS")]["count"] == 3
+    assert rows[("https://host/a/", "PASS")]["p50"] == 0.2
+    assert rows[("https://host/a/", "FAIL")]["max"] == 2.0
+    assert metrics.report()[0]["outcome"] == "FAIL"  # slowest p95 first
+
+
+class _Page:
+    tenant_url = None
+
+    def _tenant_key(self):
+        return "https://host/from-url/"
+
+
+def test_step_tenant_prefers_explicit_scope_then_page():
+    assert _step_tenant((_Page(),)) == "https://host/from-url/"
+    assert _step_tenant(()) == ""
+    with tenant_scope("https://host/explicit"):
+        assert _step_tenant((_Page(),)) == "https://host/explicit/"
@@ -0,0 +1,49 @@
+# tests/test_table_extract.py
+# utils.table_extract — no browser needed: python -m pytest -q tests/test_table_extract.py
+from decimal import Decimal
+
+import pytest
+
+from pages.finance_table_page import FinanceTablePage
+from utils.table_extract import map_columns, parse_money, pick_table
+
+ALIASES = FinanceTablePage._HISTORY_COLUMNS
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("$1,234.50", Decimal("1234.50")),
+    ("  12 ", Decimal("12")),
+    ("-$6", Decimal("-6")),
+    ("($6.00)", Decimal("-6.00")),
+    ("", None),
+    (None, None),
+    ("N/A", None),
+    ("1.2.3", None),
+])
+def test_parse_money(text, expected):
+    assert parse_money(text) == expected
+
+
+def test_map_columns_prefers_exact_headers_and_uses_each_column_once():
+    headers = ["Ticket #", "Payment Date", "Ticket Status", "Original Fine", "Amount Paid", "Amount Owed",
+               "Payment Status"]
+    assert map_columns(headers, ALIASES) == {
+        "ticket_number": 0, "date": 1, "ticket_status": 2, "original_fine": 3,
+        "amount_paid": 4, "amount_owed": 5, "payment_status": 6,
+    }
+
+
+def test_map_columns_falls_back_to_contains():
+    mapping = map_columns(["Citation Number (ref)", "Total Paid ($)", "Notes"], ALIASES)
+    assert mapping == {"ticket_number": 0, "amount_paid": 1}
+
+
+def test_pick_table_needs_required_fields():
+    tables = [
+        {"headers": ["Date", "Status"], "rows": []},
+        {"headers": ["Ticket Number", "Date", "Amount Paid"], "rows": []},
+    ]
+    table, mapping = pick_table(tables, ALIASES, FinanceTablePage._HISTORY_REQUIRED)
+    assert table is tables[1]
+    assert mapping["ticket_number"] == 0 and mapping["amount_paid"] == 2
+    assert pick_table(tables[:1], ALIASES, FinanceTablePage._HISTORY_REQUIRED) == (None, {})
@@ -0,0 +1,56 @@
+# tests/test_table_paging.py
+# utils.table_paging page turns against a scripted driver — no browser needed:
+#     python -m pytest -q tests/test_table_paging.py
+import pytest
+from selenium.common.exceptions import TimeoutException
+
+from utils import table_paging
+from utils.table_paging import iter_table_rows
+
+
+class _Page:
+    def __init__(self, driver):
+        self.driver = driver
+
+    def start_dom_watch(self, root_css="", key=None):
+        pass
+
+    def stop_dom_watch(self, root_css="", key=None):
+        pass
+
+    def wait_for_dom_settled(self, **kwargs):
+        return True  # a "Processing…" indicator is a DOM change too
+
+
+class _Driver:
+    """Three one-row pages; the new page shows up after a placeholder poll, or never if stuck."""
+
+    def __init__(self, stuck: bool = False):
+        self.page, self.stuck, self.polls = 0, stuck, 0
+
+    def execute_script(self, script, *args):
+        if script is table_paging._NEXT_PAGE_JS:
+            if self.page >= 2:
+                return False
+            before = f"row-{self.page}"
+            if not self.stuck:
+                self.page += 1
+            self.polls = 0
+            return {"before": before}
+        if script is table_paging._PAGE_STATE_JS:
+            self.polls += 1
+            return None if self.polls == 1 else f"row-{self.page}"
+        return [{"index": 0, "headers": ["Ticket"], "rows": [{"id": f"row-{self.page}", "cells": ["x"]}]}]
+
+
+@pytest.mark.parametrize("prefetch", [True, False])
+def test_every_page_once(prefetch):
+    rows = iter_table_rows(_Page(_Driver()), prefetch=prefetch)
+    assert [(r.row_id, r.page_no) for r in rows] == [("row-0", 0), ("row-1", 1), ("row-2", 2)]
+
+
+def test_page_that_never_arrives_raises_instead_of_repeating():
+    rows = iter_table_rows(_Page(_Driver(stuck=True)), settle_timeout=0.3)
+    assert next(rows).row_id == "row-0"
+    with pytest.raises(TimeoutException):
+        next(rows)
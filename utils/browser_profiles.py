@@ -0,0 +1,129 @@
+# utils/browser_profiles.py
+import functools
+import os
+import shutil
+from typing import Dict, Optional, Tuple
+
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chrome.service import Service
+
+from utils.driver_resolver import resolve_chromedriver
+from utils.driver_service import SharedChrome, shared_enabled, shared_service
+from utils.profile_template import profile_template, template_enabled
+from utils.tracing import instrument_driver
+
+PROFILE_ENV = "LEDGER_BROWSER_PROFILE"
+NETWORK_LOG_ENV = "LEDGER_NETWORK_LOG"  # "1"/"0" overrides the profile's network_log
+DEFAULT_PROFILE = "debug"
+
+# name → launch settings; "debug" keeps the original visible, maximized window.
+# network_log: chromedriver buffers every CDP Network/Page event of the session in its
+# 'performance' log so utils.network_idle.NetworkTracker can count in-flight requests.
+# That costs memory and a JSON message per event on every page, so it is off for debug,
+# where wait_for_network_idle falls back to the readyState / jQuery.active heuristic.
+PROFILES: Dict[str, dict] = {
+    "debug": {
+        "headless": False,
+        "maximized": True,
+        "detach": True,  # keep window for debugging
+        "page_load_strategy": "normal",
+        "page_load_timeout": 90,
+    },
+    "ci": {
+        "headless": True,
+        "window_size": "1366,900",
+        "page_load_strategy": "normal",
+        "page_load_timeout": 60,
+        "warm_cache": True,  # clone of the warmed profile template (utils.profile_template)
+        "network_log": True,
+        "args": ["--disable-gpu", "--disable-dev-shm-usage", "--no-sandbox"],
+    },
+    "throughput": {
+        "headless": True,
+        "window_size": "1280,800",
+        "page_load_strategy": "eager",
+        "page_load_timeout": 30,
+        "block_images": True,
+        "warm_cache": True,
+        "network_log": True,
+        "args": [
+            "--disable-gpu", "--disable-extensions", "--disable-dev-shm-usage", "--no-sandbox",
+            "--blink-settings=imagesEnabled=false",
+        ],
+    },
+}
+
+
+def profile_name(cli_value: str = None) -> str:
+    """CLI option wins over the env var; both fall back to DEFAULT_PROFILE."""
+    name = (cli_value or os.environ.get(PROFILE_ENV) or DEFAULT_PROFILE).strip().lower()
+    if name not in PROFILES:
+        raise ValueError(f"Unknown browser profile '{name}'. Choose one of: {', '.join(PROFILES)}")
+    return name
+
+
+def network_log_enabled(name: str) -> bool:
+    override = os.environ.get(NETWORK_LOG_ENV)
+    if override is not None and override.strip():
+        return override.strip() != "0"
+    return bool(PROFILES[name].get("network_log"))
+
+
+def build_options(name: str) -> Tuple[Options, int]:
+    """Chrome Options for a named profile, plus its page-load timeout (seconds)."""
+    cfg = PROFILES[name]
+    options = Options()
+
+    if cfg.get("headless"):
+        options.add_argument("--headless=new")
+    if cfg.get("maximized"):
+        options.add_argument("--start-maximized")
+    if cfg.get("window_size"):
+        options.add_argument(f"--window-size={cfg['window_size']}")
+    if cfg.get("detach"):
+        options.add_experimental_option("detach", True)
+    if cfg.get("block_images"):
+        options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
+    for arg in cfg.get("args", []):
+        options.add_argument(arg)
+
+    if network_log_enabled(name):
+        # CDP Network events for BasePage.wait_for_network_idle (read via driver.get_log("performance"))
+        options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+
+    options.page_load_strategy = cfg.get("page_load_strategy", "normal")
+    return options, cfg.get("page_load_timeout", 90)
+
+
+def launch_chrome(name: str = DEFAULT_PROFILE, user_data_dir: Optional[str] = None):
+    """
+    Chrome launched with a named profile, driver binary from the local resolver cache.
+    Sessions share this process's chromedriver (see utils.driver_service) unless
+    LEDGER_SHARED_DRIVER=0. Profiles with warm_cache start from a clone of the warmed
+    profile template unless user_data_dir is given.
+    """
+    options, page_load_timeout = build_options(name)
+
+    template = None
+    if user_data_dir is None and PROFILES[name].get("warm_cache") and template_enabled():
+        template = profile_template(name, functools.partial(launch_chrome, name))
+        user_data_dir = template.clone()
+    if user_data_dir:
+        options.add_argument(f"--user-data-dir={user_data_dir}")
+
+    try:
+        if shared_enabled():
+            drv = SharedChrome(shared_service(), options)
+        else:
+            drv = webdriver.Chrome(service=Service(resolve_chromedriver()), options=options)
+    except Exception:
+        if template is not None and user_data_dir:
+            shutil.rmtree(user_data_dir, ignore_errors=True)
+        raise
+    if template is not None and user_data_dir:
+        template.attach(drv, user_data_dir)
+    instrument_driver(drv)
+    drv.set_page_load_timeout(page_load_timeout)
+    drv.delete_all_cookies()
+    return drv
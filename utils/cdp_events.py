@@ -0,0 +1,124 @@
+# utils/cdp_events.py
+import asyncio
+import itertools
+import json
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+
+import websocket  # websocket-client, already a selenium dependency
+
+from logger_utils import get_debug_file_logger
+
+BINDING = "__ledgerNotify"
+
+
+def page_ws_url(driver) -> str:
+    """DevTools websocket of the driver's CURRENT tab (chromedriver's debuggerAddress + target id)."""
+    address = driver.capabilities["goog:chromeOptions"]["debuggerAddress"]
+    target_id = driver.execute_cdp_cmd("Target.getTargetInfo", {})["targetInfo"]["targetId"]
+    return f"ws://{address}/devtools/page/{target_id}"
+
+
+class CdpEventChannel:
+    """
+    Second DevTools connection to one tab, next to chromedriver's. A reader thread
+    receives CDP events and resolves asyncio futures registered with wait_for(),
+    so flows await events instead of polling. Also exposes a JS binding
+    (window.__ledgerNotify) that page scripts call to push their own events.
+    """
+
+    def __init__(self, ws_url: str, loop: asyncio.AbstractEventLoop):
+        self.ws_url = ws_url
+        self.loop = loop
+        self.debug_log = get_debug_file_logger()
+        self._ws = None
+        self._ids = itertools.count(1)
+        self._replies: Dict[int, asyncio.Future] = {}
+        self._waiters: List[Tuple[str, Callable[[dict], bool], asyncio.Future]] = []
+        self._listeners: List[Callable[[str, dict], None]] = []
+        self._lock = threading.Lock()
+        self._reader: Optional[threading.Thread] = None
+
+    # ---- lifecycle ----
+    async def open(self, domains=("Page", "Network", "Runtime")):
+        # Chrome rejects DevTools websockets that send an Origin header
+        self._ws = await self.loop.run_in_executor(
+            None, lambda: websocket.create_connection(self.ws_url, suppress_origin=True))
+        self._reader = threading.Thread(target=self._read_loop, name="cdp-events", daemon=True)
+        self._reader.start()
+        for domain in domains:
+            await self.send(f"{domain}.enable")
+        await self.send("Runtime.addBinding", {"name": BINDING})
+        return self
+
+    async def close(self):
+        ws, self._ws = self._ws, None
+        if ws is not None:
+            await self.loop.run_in_executor(None, ws.close)
+
+    # ---- commands / events ----
+    async def send(self, method: str, params: Optional[dict] = None) -> dict:
+        msg_id = next(self._ids)
+        fut = self.loop.create_future()
+        self._replies[msg_id] = fut
+        payload = json.dumps({"id": msg_id, "method": method, "params": params or {}})
+        with self._lock:
+            self._ws.send(payload)
+        return await fut
+
+    def wait_for(self, method: str, predicate: Optional[Callable[[dict], bool]] = None) -> asyncio.Future:
+        """Future resolved with the params of the next `method` event matching predicate. Register BEFORE acting."""
+        fut = self.loop.create_future()
+        self._waiters.append((method, predicate or (lambda params: True), fut))
+        return fut
+
+    def add_listener(self, callback: Callable[[str, dict], None]):
+        """callback(method, params) for every event, on the event loop."""
+        self._listeners.append(callback)
+
+    def remove_listener(self, callback: Callable[[str, dict], None]):
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    # ---- reader thread ----
+    def _read_loop(self):
+        while self._ws is not None:
+            try:
+                raw = self._ws.recv()
+            except Exception as e:
+                if self._ws is not None:
+                    self.debug_log.debug("CdpEventChannel: connection closed (%s)", e)
+                break
+            if not raw:
+                continue
+            try:
+                msg = json.loads(raw)
+            except ValueError:
+                continue
+            self.loop.call_soon_threadsafe(self._dispatch, msg)
+
+    def _dispatch(self, msg: dict):
+        if "id" in msg:
+            fut = self._replies.pop(msg["id"], None)
+            if fut is not None and not fut.done():
+                if "error" in msg:
+                    fut.set_exception(RuntimeError(f"CDP error: {msg['error']}"))
+                else:
+                    fut.set_result(msg.get("result", {}))
+            return
+
+        method, params = msg.get("method", ""), msg.get("params", {})
+        for callback in list(self._listeners):
+            callback(method, params)
+        for waiter in list(self._waiters):
+            w_method, predicate, fut = waiter
+            if fut.done():
+                self._waiters.remove(waiter)
+            elif w_method == method:
+                try:
+                    matched = predicate(params)
+                except Exception:
+                    matched = False
+                if matched:
+                    fut.set_result(params)
+                    self._waiters.remove(waiter)
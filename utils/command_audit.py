@@ -0,0 +1,169 @@
+# utils/command_audit.py
+import contextvars
+import hashlib
+import json
+import os
+import threading
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+
+BUDGET_ENV = "LEDGER_STEP_CMD_BUDGET"      # round-trips per log_step before it is flagged
+REPEAT_ENV = "LEDGER_REPEAT_FIND_LIMIT"    # identical find / script commands per log_step before it is flagged
+DEFAULT_BUDGET = 150
+DEFAULT_REPEAT_LIMIT = 5
+
+_FIND_COMMANDS = {"findElement", "findElements", "findChildElement", "findChildElements"}
+_SCRIPT_COMMANDS = {"executeScript", "executeAsyncScript", "w3cExecuteScript", "w3cExecuteScriptAsync"}
+# utils.frame_map re-counts top-level frames on purpose to notice injected iframes
+_IGNORED_FINDS = {("css selector", "iframe, frame")}
+
+_frames: contextvars.ContextVar = contextvars.ContextVar("ledger_command_frames", default=())
+_polling: contextvars.ContextVar = contextvars.ContextVar("ledger_command_polling", default=False)
+
+
+@contextmanager
+def polling():
+    """Commands issued inside (a wait's polls) count toward the budget but never as repeats."""
+    token = _polling.set(True)
+    try:
+        yield
+    finally:
+        _polling.reset(token)
+
+
+class StepCommands:
+    """WebDriver commands issued while one log_step invocation was open (nested steps included)."""
+
+    __slots__ = ("name", "count", "seconds", "by_command", "finds")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.count = 0
+        self.seconds = 0.0
+        self.by_command: Counter = Counter()
+        self.finds: Counter = Counter()
+
+    def repeated_finds(self, limit: int) -> List[Tuple[str, int]]:
+        return [(key, n) for key, n in self.finds.most_common() if n > limit]
+
+
+class CommandAudit:
+    """
+    Counts and times every WebDriver round-trip per active log_step and flags steps that
+    exceed the round-trip budget or repeat the same find / script (N+1 style lookups in a loop).
+    Fed by the RemoteConnection wrapper in utils.tracing.instrument_driver.
+    """
+
+    def __init__(self, budget: Optional[int] = None, repeat_limit: Optional[int] = None):
+        self.budget = budget if budget is not None else int(os.environ.get(BUDGET_ENV, DEFAULT_BUDGET))
+        self.repeat_limit = (repeat_limit if repeat_limit is not None
+                             else int(os.environ.get(REPEAT_ENV, DEFAULT_REPEAT_LIMIT)))
+        self._lock = threading.Lock()
+        self._steps: Dict[str, dict] = defaultdict(lambda: {
+            "invocations": 0, "commands": 0, "max_commands": 0, "command_seconds": 0.0,
+            "over_budget": 0, "repeated_find": 0, "top_commands": Counter(), "repeated": Counter(),
+        })
+
+    # ---- recording ----
+    @contextmanager
+    def step(self, name: str):
+        frame = StepCommands(name)
+        token = _frames.set(_frames.get() + (frame,))
+        try:
+            yield frame
+        finally:
+            _frames.reset(token)
+            self._close(frame)
+
+    def record(self, command: str, params: Optional[dict], seconds: float):
+        frames = _frames.get()
+        if not frames:
+            return
+        find_key = None if _polling.get() else _repeat_key(command, params)
+        for frame in frames:
+            frame.count += 1
+            frame.seconds += seconds
+            frame.by_command[command] += 1
+            if find_key:
+                frame.finds[find_key] += 1
+
+    def problems(self, frame: StepCommands) -> List[str]:
+        issues = []
+        if frame.count > self.budget:
+            issues.append(f"{frame.count} round-trips (budget {self.budget})")
+        for key, n in frame.repeated_finds(self.repeat_limit)[:3]:
+            issues.append(f"{n}x {key}")
+        return issues
+
+    def _close(self, frame: StepCommands):
+        with self._lock:
+            agg = self._steps[frame.name]
+            agg["invocations"] += 1
+            agg["commands"] += frame.count
+            agg["max_commands"] = max(agg["max_commands"], frame.count)
+            agg["command_seconds"] += frame.seconds
+            agg["top_commands"].update(frame.by_command)
+            if frame.count > self.budget:
+                agg["over_budget"] += 1
+            repeated = frame.repeated_finds(self.repeat_limit)
+            if repeated:
+                agg["repeated_find"] += 1
+                agg["repeated"].update(dict(repeated))
+
+    # ---- reporting ----
+    def report(self) -> List[dict]:
+        """One row per step, most round-trips per invocation first."""
+        with self._lock:
+            rows = []
+            for name, agg in self._steps.items():
+                n = agg["invocations"]
+                rows.append({
+                    "step": name,
+                    "invocations": n,
+                    "avg_commands": round(agg["commands"] / n, 1) if n else 0,
+                    "max_commands": agg["max_commands"],
+                    "avg_command_ms": round(agg["command_seconds"] / agg["commands"] * 1000, 1) if agg["commands"] else 0,
+                    "over_budget": agg["over_budget"],
+                    "repeated_find": agg["repeated_find"],
+                    "top_commands": dict(agg["top_commands"].most_common(5)),
+                    "repeated": dict(agg["repeated"].most_common(5)),
+                })
+        rows.sort(key=lambda r: r["avg_commands"], reverse=True)
+        return rows
+
+    def flagged(self, rows: Optional[List[dict]] = None) -> List[dict]:
+        return [r for r in (self.report() if rows is None else rows) if r["over_budget"] or r["repeated_find"]]
+
+    def write_report(self, path: str) -> List[dict]:
+        rows = self.report()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"budget": self.budget, "repeat_limit": self.repeat_limit, "steps": rows}, f, indent=2)
+        return rows
+
+
+def _repeat_key(command: str, params: Optional[dict]) -> Optional[str]:
+    """Identity of a find / script command for repeat detection (None for anything else)."""
+    if not params:
+        return None
+    if command in _FIND_COMMANDS:
+        if (params.get("using"), params.get("value")) in _IGNORED_FINDS:
+            return None
+        key = f"{command} {params.get('using')}={params.get('value')}"
+        if params.get("id"):
+            key += f" in {params['id'][:12]}"
+        return key
+    if command in _SCRIPT_COMMANDS:
+        script = params.get("script") or ""
+        body = json.dumps([script, params.get("args")], sort_keys=True, default=repr)
+        digest = hashlib.sha1(body.encode("utf-8")).hexdigest()[:10]
+        return f"{command} {' '.join(script.split())[:40]!r} #{digest}"
+    return None
+
+
+_audit = CommandAudit()
+
+
+def get_command_audit() -> CommandAudit:
+    return _audit
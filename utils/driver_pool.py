@@ -0,0 +1,130 @@
+# utils/driver_pool.py
+import queue
+import threading
+from typing import Callable, List, Optional
+
+from logger_utils import get_debug_file_logger
+
+# JS run on the page being reset: close any open modal / SweetAlert and wipe storage
+_RESET_PAGE_JS = """
+try { if (window.jQuery) { jQuery('.modal.show, .modal.in').modal('hide'); } } catch (e) {}
+document.querySelectorAll('.sweet-alert, .swal2-container, .modal-backdrop')
+    .forEach(function (el) { el.remove(); });
+try { window.localStorage.clear(); } catch (e) {}
+try { window.sessionStorage.clear(); } catch (e) {}
+"""
+
+
+class DriverPool:
+    """
+    Keeps up to `size` warm browser sessions alive for the whole pytest session.
+    acquire() hands one out (launching lazily if none is idle), release() resets
+    its state (extra windows, modals, storage, cookies) and puts it back.
+    A session that fails to reset is quit and replaced on the next acquire().
+    """
+
+    def __init__(self, factory: Callable, size: int = 1, acquire_timeout: int = 300):
+        self.factory = factory
+        self.size = max(1, int(size))
+        self.acquire_timeout = acquire_timeout
+        self.debug_log = get_debug_file_logger()
+        self._idle: "queue.Queue" = queue.Queue()
+        self._all: List = []
+        self._lock = threading.Lock()
+
+    # ---- public API ----
+    def acquire(self):
+        try:
+            drv = self._idle.get_nowait()
+            self.debug_log.debug("DriverPool: reusing warm session %s", id(drv))
+            return drv
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            if len(self._all) < self.size:
+                drv = self.factory()
+                self._all.append(drv)
+                self.debug_log.debug("DriverPool: launched session %s (%s/%s)", id(drv), len(self._all), self.size)
+                return drv
+
+        # pool is full: wait for another test to hand a session back
+        return self._idle.get(timeout=self.acquire_timeout)
+
+    def release(self, drv):
+        if self.reset(drv):
+            self._idle.put(drv)
+        else:
+            self.discard(drv)
+
+    def discard(self, drv):
+        """Drop a broken session so the next acquire() launches a fresh one."""
+        with self._lock:
+            if drv in self._all:
+                self._all.remove(drv)
+        self._quit(drv)
+
+    def reset(self, drv) -> bool:
+        """Bring a used session back to a blank state. Returns False if the session is unusable."""
+        try:
+            handles = drv.window_handles
+            for extra in handles[1:]:
+                drv.switch_to.window(extra)
+                drv.close()
+            drv.switch_to.window(handles[0])
+            drv.switch_to.default_content()
+
+            self._reset_page(drv)
+            self._clear_cookies(drv)
+            drv.get("about:blank")
+            return True
+        except Exception as e:
+            self.debug_log.debug("DriverPool: reset failed for %s (%s)", id(drv), e)
+            return False
+
+    def close_all(self):
+        with self._lock:
+            drivers, self._all = list(self._all), []
+        for drv in drivers:
+            self._quit(drv)
+
+    # ---- helpers ----
+    def _reset_page(self, drv):
+        try:
+            drv.execute_script(_RESET_PAGE_JS)
+        except Exception:
+            pass
+        # storage of the current origin (IndexedDB, cache storage, service workers, ...)
+        origin = self._origin(drv)
+        if origin and hasattr(drv, "execute_cdp_cmd"):
+            try:
+                drv.execute_cdp_cmd("Storage.clearDataForOrigin", {"origin": origin, "storageTypes": "all"})
+            except Exception:
+                pass
+
+    def _clear_cookies(self, drv):
+        # CDP wipes cookies for every domain, delete_all_cookies only the current one
+        if hasattr(drv, "execute_cdp_cmd"):
+            try:
+                drv.execute_cdp_cmd("Network.clearBrowserCookies", {})
+                return
+            except Exception:
+                pass
+        drv.delete_all_cookies()
+
+    @staticmethod
+    def _origin(drv) -> Optional[str]:
+        try:
+            origin = drv.execute_script("return window.location.origin")
+        except Exception:
+            return None
+        if not origin or origin == "null" or not origin.startswith("http"):
+            return None
+        return origin
+
+    @staticmethod
+    def _quit(drv):
+        try:
+            drv.quit()
+        except Exception:
+            pass
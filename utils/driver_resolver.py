@@ -0,0 +1,182 @@
+# utils/driver_resolver.py
+import functools
+import hashlib
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+from typing import Optional
+
+from logger_utils import get_debug_file_logger
+
+# On-disk cache: <CACHE_DIR>/sha256/<digest>/<driver binary> + index.json (chrome version → digest)
+CACHE_DIR = os.environ.get("LEDGER_DRIVER_CACHE", os.path.join(os.path.expanduser("~"), ".cache", "ledger_drivers"))
+INDEX_PATH = os.path.join(CACHE_DIR, "index.json")
+
+# Configured local fallback binary, and a switch to never touch the network
+LOCAL_DRIVER_ENV = "CHROMEDRIVER_PATH"
+OFFLINE_ENV = "LEDGER_DRIVER_OFFLINE"
+
+_CHROME_CANDIDATES = [
+    "google-chrome", "google-chrome-stable", "chromium", "chromium-browser",
+    "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome",
+    r"C:\Program Files\Google\Chrome\Application\chrome.exe",
+    r"C:\Program Files (x86)\Google\Chrome\Application\chrome.exe",
+]
+
+debug_log = get_debug_file_logger()
+
+
+# ---- chrome version detection ----
+def _chrome_binary() -> Optional[str]:
+    configured = os.environ.get("CHROME_BINARY")
+    if configured and os.path.exists(configured):
+        return configured
+    for cand in _CHROME_CANDIDATES:
+        path = cand if os.path.isabs(cand) else shutil.which(cand)
+        if path and os.path.exists(path):
+            return path
+    return None
+
+
+def _read_chrome_version(binary: str) -> Optional[str]:
+    if sys.platform.startswith("win"):
+        # chrome.exe --version does not print on Windows; ask the registry instead
+        cmd = ["reg", "query", r"HKEY_CURRENT_USER\Software\Google\Chrome\BLBeacon", "/v", "version"]
+    else:
+        cmd = [binary, "--version"]
+    try:
+        out = subprocess.run(cmd, capture_output=True, text=True, timeout=10).stdout
+    except Exception as e:
+        debug_log.debug("driver_resolver: could not query Chrome version (%s)", e)
+        return None
+    m = re.search(r"(\d+\.\d+\.\d+\.\d+)", out or "")
+    return m.group(1) if m else None
+
+
+def detect_chrome_version(index: Optional[dict] = None) -> Optional[str]:
+    """Installed Chrome version; remembered in the index until the binary changes."""
+    binary = _chrome_binary()
+    if not binary:
+        return None
+    stamp = f"{binary}|{os.path.getmtime(binary)}"
+    index = _load_index() if index is None else index
+    cached = index.get("chrome", {})
+    if cached.get("stamp") == stamp:
+        return cached.get("version")
+
+    version = _read_chrome_version(binary)
+    if version:
+        index["chrome"] = {"stamp": stamp, "version": version}
+        _save_index(index)
+    return version
+
+
+# ---- content-addressed cache ----
+def _load_index() -> dict:
+    try:
+        with open(INDEX_PATH, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception:
+        return {}
+
+
+def _save_index(index: dict):
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    tmp = INDEX_PATH + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(index, f, indent=2)
+    os.replace(tmp, INDEX_PATH)
+
+
+def _sha256(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _store(binary: str) -> str:
+    """Copy a driver binary into the cache under its digest; return the cached path."""
+    digest = _sha256(binary)
+    target_dir = os.path.join(CACHE_DIR, "sha256", digest)
+    target = os.path.join(target_dir, os.path.basename(binary))
+    if not os.path.exists(target):
+        os.makedirs(target_dir, exist_ok=True)
+        tmp = target + ".tmp"
+        shutil.copy2(binary, tmp)
+        os.replace(tmp, target)
+    return target
+
+
+def _remember(index: dict, key: Optional[str], binary: str) -> str:
+    """
+    Store `binary` and index it under the Chrome major version (the driver's own version
+    when Chrome could not be detected) and as the last resolved driver; return the cached path.
+    """
+    cached = _store(binary)
+    entry = {"path": cached, "sha256": _sha256(cached)}
+    key = key or _version_key(_driver_version(cached))
+    if key:
+        index.setdefault("drivers", {})[key] = entry
+    index["last"] = dict(entry, chrome=key)
+    _save_index(index)
+    return cached
+
+
+def _driver_version(binary: str) -> Optional[str]:
+    try:
+        out = subprocess.run([binary, "--version"], capture_output=True, text=True, timeout=10).stdout
+    except Exception as e:
+        debug_log.debug("driver_resolver: could not query %s version (%s)", binary, e)
+        return None
+    m = re.search(r"(\d+\.\d+\.\d+\.\d+)", out or "")
+    return m.group(1) if m else None
+
+
+def _version_key(chrome_version: Optional[str]) -> Optional[str]:
+    # chromedriver is compatible across a Chrome major version
+    return chrome_version.split(".")[0] if chrome_version else None
+
+
+# ---- public API ----
+@functools.lru_cache(maxsize=1)
+def resolve_chromedriver() -> str:
+    """
+    Path to a chromedriver matching the installed Chrome.
+    Order: on-disk cache → CHROMEDRIVER_PATH → webdriver-manager download (unless offline).
+    Whatever is found is copied into the cache, so the next run is a cache hit; if Chrome's
+    version cannot be detected, the last resolved driver is reused.
+    Memoized per process, so only the first call pays for detection.
+    """
+    index = _load_index()
+    key = _version_key(detect_chrome_version(index))
+
+    # Chrome not detectable (unusual install path, no registry entry): trust the last driver we resolved
+    entry = index.get("drivers", {}).get(key) if key else index.get("last")
+    if entry and os.path.exists(entry["path"]):
+        debug_log.debug("driver_resolver: cache hit for Chrome %s → %s", key or "(undetected)", entry["path"])
+        return entry["path"]
+
+    local = os.environ.get(LOCAL_DRIVER_ENV)
+    if local and os.path.exists(local):
+        cached = _remember(index, key, local)
+        debug_log.debug("driver_resolver: cached configured driver %s for Chrome %s → %s", local, key, cached)
+        return cached
+
+    if os.environ.get(OFFLINE_ENV, "").lower() not in ("1", "true", "yes"):
+        try:
+            from webdriver_manager.chrome import ChromeDriverManager
+            cached = _remember(index, key, ChromeDriverManager().install())
+            debug_log.debug("driver_resolver: cached driver for Chrome %s → %s", key, cached)
+            return cached
+        except Exception as e:
+            debug_log.debug("driver_resolver: download failed (%s)", e)
+
+    raise RuntimeError(
+        f"No chromedriver for Chrome {key or '?'}: not in cache ({CACHE_DIR}), "
+        f"download unavailable, and {LOCAL_DRIVER_ENV} is not set to an existing file."
+    )
@@ -0,0 +1,159 @@
+# utils/driver_service.py
+import atexit
+import json
+import os
+import threading
+from typing import Optional
+
+import urllib3
+from selenium.webdriver import Chrome
+from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.chromium.remote_connection import ChromiumRemoteConnection
+from selenium.webdriver.remote.webdriver import WebDriver as RemoteWebDriver
+
+from logger_utils import get_debug_file_logger
+from utils.driver_resolver import resolve_chromedriver
+
+SHARED_ENV = "LEDGER_SHARED_DRIVER"          # "0" → one chromedriver process per session (old behaviour)
+HEALTH_INTERVAL_ENV = "LEDGER_DRIVER_HEALTH_S"
+DEFAULT_HEALTH_INTERVAL = 5.0
+
+
+class SharedChromeService(Service):
+    """
+    One chromedriver process per worker, shared by every session it creates.
+    Sessions call start()/stop() as usual: start() only (re)launches the process when
+    it is not healthy, stop() is a no-op. shutdown() really stops it (atexit).
+    A daemon thread polls /status and restarts a crashed process.
+    """
+
+    def __init__(self, executable_path: str, health_interval: float = DEFAULT_HEALTH_INTERVAL, **kwargs):
+        super().__init__(executable_path, **kwargs)
+        self.health_interval = health_interval
+        self.debug_log = get_debug_file_logger()
+        self.restarts = 0
+        self.http = urllib3.PoolManager(num_pools=1, maxsize=16, block=False)
+        self._lock = threading.RLock()
+        self._running = False
+        self._stop_monitor = threading.Event()
+        self._monitor: Optional[threading.Thread] = None
+
+    # ---- Service interface used by webdriver.Chrome ----
+    def start(self) -> None:
+        with self._lock:
+            if self._running and self.healthy():
+                return
+            if self._running:
+                self.debug_log.debug("SharedChromeService: %s unhealthy, restarting", self.service_url)
+                self.restarts += 1
+                self._kill()
+            super().start()
+            self._running = True
+            self.debug_log.debug("SharedChromeService: chromedriver up on %s (pid %s)",
+                                 self.service_url, self.process.pid)
+        self._start_monitor()
+
+    def stop(self) -> None:
+        """Sessions do not own the process; see shutdown()."""
+
+    def shutdown(self):
+        self._stop_monitor.set()
+        with self._lock:
+            if self._running:
+                self._kill()
+                self._running = False
+        self.http.clear()
+
+    # ---- health ----
+    def healthy(self) -> bool:
+        process = getattr(self, "process", None)
+        if process is None or process.poll() is not None:
+            return False
+        try:
+            resp = self.http.request("GET", f"{self.service_url}/status", timeout=2.0, retries=False)
+            return resp.status == 200 and json.loads(resp.data).get("value", {}).get("ready", True)
+        except Exception:
+            return False
+
+    def _start_monitor(self):
+        if self.health_interval <= 0 or (self._monitor is not None and self._monitor.is_alive()):
+            return
+        self._monitor = threading.Thread(target=self._watch, name="chromedriver-health", daemon=True)
+        self._monitor.start()
+
+    def _watch(self):
+        while not self._stop_monitor.wait(self.health_interval):
+            if not self.healthy():
+                try:
+                    self.start()
+                except Exception as e:
+                    self.debug_log.debug("SharedChromeService: restart failed (%s)", e)
+
+    def _kill(self):
+        try:
+            Service.stop(self)
+        except Exception:
+            pass
+        self.process = None
+
+
+class _PooledConnection(ChromiumRemoteConnection):
+    """Command executor that sends over the service's keep-alive pool instead of its own."""
+
+    def __init__(self, service: SharedChromeService, **kwargs):
+        self._shared_http = service.http
+        super().__init__(remote_server_addr=service.service_url, keep_alive=True, **kwargs)
+
+    def _get_connection_manager(self):
+        return self._shared_http
+
+    def close(self):
+        # the pool outlives this session
+        pass
+
+
+class SharedChrome(Chrome):
+    """webdriver.Chrome attached to a SharedChromeService (CDP, get_log etc. unchanged)."""
+
+    def __init__(self, service: SharedChromeService, options):
+        self.service = service
+        service.start()
+        executor = _PooledConnection(
+            service,
+            browser_name="chrome",
+            vendor_prefix="goog",
+            ignore_proxy=options._ignore_local_proxy,
+        )
+        try:
+            RemoteWebDriver.__init__(self, command_executor=executor, options=options)
+        except Exception:
+            self.quit()
+            raise
+        self._is_remote = False
+
+
+_service: Optional[SharedChromeService] = None
+_service_pid: Optional[int] = None
+_service_lock = threading.Lock()
+
+
+def shared_enabled() -> bool:
+    return os.environ.get(SHARED_ENV, "1") != "0"
+
+
+def shared_service() -> SharedChromeService:
+    """This process's chromedriver service (a forked worker gets its own)."""
+    global _service, _service_pid
+    with _service_lock:
+        if _service is None or _service_pid != os.getpid():
+            interval = float(os.environ.get(HEALTH_INTERVAL_ENV, DEFAULT_HEALTH_INTERVAL))
+            _service = SharedChromeService(resolve_chromedriver(), health_interval=interval)
+            _service_pid = os.getpid()
+            atexit.register(_service.shutdown)
+        return _service
+
+
+def shutdown_shared_service():
+    with _service_lock:
+        if _service is not None and _service_pid == os.getpid():
+            _service.shutdown()
@@ -0,0 +1,105 @@
+# utils/flow_profiler.py
+import os
+import sys
+import threading
+from collections import Counter
+from typing import Dict, List, Optional
+
+import logger_utils
+
+NO_STEP = "(no step)"
+MAX_DEPTH = 128
+
+
+class FlowSampler:
+    """
+    Statistical sampler for the test process: every `interval` seconds it snapshots the
+    Python stacks of the main thread and of any thread inside a log_step, and counts
+    them as collapsed stacks (flamegraph.pl / speedscope / Perfetto "collapsed" input).
+
+    log_step frames become "step:<name>" and each stack is rooted at the outermost
+    active step, so samples group by step. The active step is read from the wrapper
+    frame's closure, so log_step itself needs no extra bookkeeping.
+    """
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = max(0.001, float(interval))
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._main_ident = threading.main_thread().ident
+
+    def start(self):
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="flow-sampler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> Counter:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        return self.stacks
+
+    def by_step(self) -> Dict[str, int]:
+        """Samples per outermost step (the root of every collapsed stack)."""
+        totals: Counter = Counter()
+        for stack, n in self.stacks.items():
+            totals[stack.split(";", 1)[0]] += n
+        return dict(totals.most_common())
+
+    # ---- sampling ----
+    def _run(self):
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                stack = _collapse(frame, keep_unstepped=ident == self._main_ident)
+                if stack is not None:
+                    self.stacks[stack] += 1
+            self.samples += 1
+
+
+def _collapse(frame, keep_unstepped: bool) -> Optional[str]:
+    """root→leaf "a;b;c" for one thread, rooted at its outermost log_step (None if no step and not kept)."""
+    labels: List[str] = []
+    outermost_step = None
+    depth = 0
+    while frame is not None and depth < MAX_DEPTH:
+        code = frame.f_code
+        if code is _STEP_WRAPPER_CODE:
+            label = f"step:{frame.f_locals.get('name', '?')}"
+            outermost_step = len(labels)
+        else:
+            label = f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+        labels.append(label)
+        frame = frame.f_back
+        depth += 1
+    if outermost_step is not None:
+        labels = labels[:outermost_step + 1]
+    elif not keep_unstepped:
+        return None
+    else:
+        labels.append(NO_STEP)
+    labels.reverse()
+    return ";".join(labels)
+
+
+def _step_wrapper_code():
+    # every log_step(...) wrapper shares one code object
+    return logger_utils.log_step("profiler probe")(lambda: None).__code__
+
+
+_STEP_WRAPPER_CODE = _step_wrapper_code()
+
+
+def write_collapsed(path: str, stacks: Counter) -> int:
+    """One "stack count" line per distinct stack. Returns the number of samples written."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        for stack, n in stacks.most_common():
+            f.write(f"{stack} {n}\n")
+    return sum(stacks.values())
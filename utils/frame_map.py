@@ -0,0 +1,84 @@
+# utils/frame_map.py
+import weakref
+from typing import Dict, List, Optional, Tuple
+
+from selenium.webdriver.common.by import By
+
+from utils.tab_pool import per_tab
+
+FRAME_SELECTOR = (By.CSS_SELECTOR, "iframe, frame")
+
+# timeOrigin changes on every document load; href catches in-app route changes
+_PAGE_TOKEN_JS = "return String(performance.timeOrigin) + '|' + location.href;"
+
+FramePath = Tuple[int, ...]  # index of the frame element at each nesting level; () = default content
+
+
+class FrameMap:
+    """
+    Per-driver frame tree for the current page load, plus a memo of which
+    frame each locator set was last found in. Both reset on navigation.
+    """
+
+    def __init__(self):
+        self.token: Optional[str] = None
+        self.paths: Optional[List[FramePath]] = None
+        self.top_count: Optional[int] = None  # top-level frames when paths were built
+        self.memo: Dict[tuple, FramePath] = {}
+
+    def sync(self, driver) -> bool:
+        """Drop the tree and memo if the top-level page changed. Returns True if it did."""
+        driver.switch_to.default_content()
+        try:
+            token = driver.execute_script(_PAGE_TOKEN_JS)
+        except Exception:
+            token = None
+        if token is None or token != self.token:
+            self.token, self.paths, self.top_count, self.memo = token, None, None, {}
+            return True
+        return False
+
+    def frame_paths(self, driver, max_depth: int = 3, refresh: bool = False) -> List[FramePath]:
+        """
+        All (nested) frame paths, depth-first. Reused within a page load while the
+        number of top-level frames is unchanged (one find per call); refresh=True
+        re-walks the tree, e.g. after a scan missed and a nested frame may have appeared.
+        Expects default content to be selected.
+        """
+        top_count = len(driver.find_elements(*FRAME_SELECTOR))
+        if self.paths is None or refresh or top_count != self.top_count:
+            paths: List[FramePath] = []
+            self._walk(driver, (), paths, max_depth)
+            driver.switch_to.default_content()
+            if self.paths is not None and paths != self.paths:
+                self.memo = {}  # frames were inserted/removed: remembered indices may be stale
+            self.paths, self.top_count = paths, top_count
+        return self.paths
+
+    def _walk(self, driver, prefix: FramePath, out: List[FramePath], depth: int):
+        if depth <= 0:
+            return
+        count = len(driver.find_elements(*FRAME_SELECTOR))
+        for idx in range(count):
+            path = prefix + (idx,)
+            out.append(path)
+            try:
+                switch_to_path(driver, path)
+                self._walk(driver, path, out, depth - 1)
+            except Exception:
+                continue
+
+
+def switch_to_path(driver, path: FramePath):
+    driver.switch_to.default_content()
+    for idx in path:
+        frames = driver.find_elements(*FRAME_SELECTOR)
+        driver.switch_to.frame(frames[idx])
+
+
+_maps: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+
+def frame_map_for(driver) -> FrameMap:
+    """FrameMap of the driver's current tab (one per TabPool thread)."""
+    return per_tab(_maps, driver, FrameMap)
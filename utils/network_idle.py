@@ -0,0 +1,117 @@
+# utils/network_idle.py
+import json
+import re
+import threading
+import time
+import weakref
+from typing import Dict, Iterable, Optional
+
+from logger_utils import get_debug_file_logger
+
+# Requests that never "finish" in a useful sense and should not block idleness
+DEFAULT_IGNORE = (
+    r"google-analytics\.com", r"googletagmanager\.com", r"/socket\.io/", r"\.woff2?(\?|$)",
+)
+
+# Fallback for drivers without CDP performance logs: one round trip per poll
+_HEURISTIC_JS = "return document.readyState === 'complete' && (window.jQuery ? jQuery.active : 0) === 0;"
+
+
+class NetworkTracker:
+    """
+    Counts in-flight requests of one Chromium session from the CDP Network events
+    chromedriver buffers in the 'performance' log (enabled per profile, see network_log in
+    utils/browser_profiles.py). available is False on drivers without that log.
+    One tracker per driver, because the log is drained session-wide; pending() and
+    activity() can be narrowed to one tab (TabPool).
+    """
+
+    def __init__(self, driver, stale_after: float = 30.0):
+        self.driver = driver
+        self.stale_after = stale_after
+        self.inflight: Dict[tuple, tuple] = {}  # (webview, requestId) → (url, started)
+        self.last_activity = time.monotonic()
+        self.tab_activity: Dict[str, float] = {}  # webview → last request start/finish there
+        self.available: Optional[bool] = None
+        self.debug_log = get_debug_file_logger()
+        self._lock = threading.Lock()  # TabPool threads pump the same tracker
+
+    def pump(self):
+        """Drain buffered CDP events and update the in-flight set."""
+        try:
+            entries = self.driver.get_log("performance")
+            self.available = True
+        except Exception as e:
+            if self.available is None:
+                self.debug_log.debug("NetworkTracker: no CDP performance log (%s); using heuristic", e)
+            self.available = False
+            return
+
+        with self._lock:
+            now = time.monotonic()
+            for entry in entries:
+                try:
+                    raw = json.loads(entry["message"])
+                    msg, webview = raw["message"], _tab_id(raw.get("webview"))
+                except Exception:
+                    continue
+                method, params = msg.get("method", ""), msg.get("params", {})
+                key = (webview, params.get("requestId"))
+                if method == "Network.requestWillBeSent":
+                    self.inflight[key] = (params.get("request", {}).get("url", ""), now)
+                    self._touch(webview, now)
+                elif method in ("Network.loadingFinished", "Network.loadingFailed"):
+                    if self.inflight.pop(key, None) is not None:
+                        self._touch(webview, now)
+                elif method == "Page.frameNavigated" and not params.get("frame", {}).get("parentId"):
+                    # new top-level document: requests of the old page (in that tab) no longer count
+                    for k in [k for k in self.inflight if k[0] == webview]:
+                        self.inflight.pop(k, None)
+                    self._touch(webview, now)
+
+            # long-polls / hung requests must not block forever
+            for key, (url, started) in list(self.inflight.items()):
+                if now - started > self.stale_after:
+                    self.inflight.pop(key, None)
+
+    def _touch(self, webview: Optional[str], now: float):
+        self.last_activity = now
+        if webview:
+            self.tab_activity[webview] = now
+
+    def pending(self, patterns: Iterable["re.Pattern"], tab: Optional[str] = None) -> int:
+        """In-flight requests (all tabs, or only the tab whose window handle is given)."""
+        tab = _tab_id(tab)
+        with self._lock:
+            return sum(1 for (webview, _), (url, _) in self.inflight.items()
+                       if (tab is None or webview == tab) and not any(p.search(url) for p in patterns))
+
+    def activity(self, tab: Optional[str] = None) -> float:
+        """Monotonic time of the last request start/finish (in `tab` if given)."""
+        if tab is None:
+            return self.last_activity
+        return self.tab_activity.get(_tab_id(tab), 0.0)
+
+
+_trackers: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+
+def _tab_id(handle: Optional[str]) -> Optional[str]:
+    # chromedriver window handles are the DevTools target ids the performance log calls "webview"
+    if not handle:
+        return None
+    return handle[len("CDwindow-"):] if handle.startswith("CDwindow-") else handle
+
+
+def tracker_for(driver) -> NetworkTracker:
+    tracker = _trackers.get(driver)
+    if tracker is None:
+        tracker = _trackers[driver] = NetworkTracker(driver)
+    return tracker
+
+
+def heuristic_ready(driver) -> bool:
+    try:
+        return bool(driver.execute_script(_HEURISTIC_JS))
+    except Exception:
+        return False
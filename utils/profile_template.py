@@ -0,0 +1,224 @@
+# utils/profile_template.py
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import weakref
+from typing import Callable, List, Optional
+
+from logger_utils import get_debug_file_logger
+from utils.paths import abspath_from_root
+
+TEMPLATE_ROOT = os.environ.get("LEDGER_PROFILE_TEMPLATE_DIR", abspath_from_root(".cache", "chrome_profiles"))
+ENABLED_ENV = "LEDGER_PROFILE_TEMPLATE"           # "0" → every session starts from an empty profile
+MAX_AGE_ENV = "LEDGER_PROFILE_TEMPLATE_MAX_AGE"   # hours before the template is rebuilt in the background
+URLS_ENV = "LEDGER_PROFILE_TEMPLATE_URLS"         # comma-separated extra pages to warm
+DEFAULT_MAX_AGE_H = 24.0
+BUILD_LOCK_STALE = 15 * 60
+DATA_FILES = ("ledger_client_data.json", "adjustment_data.json")
+
+# Chrome runtime files that must not travel into a clone
+_SKIP = ("SingletonLock", "SingletonSocket", "SingletonCookie", "lockfile", "Crashpad")
+
+# Auth state is dropped from the template, the HTTP cache is what we keep
+_CLEAR_STORAGE = "cookies,local_storage,indexeddb,websql,service_workers"
+
+
+def template_enabled() -> bool:
+    return os.environ.get(ENABLED_ENV, "1") != "0"
+
+
+def warm_clients() -> List[dict]:
+    """Distinct tenants from the data files (base_url, username, password)."""
+    seen, clients = set(), []
+    for name in DATA_FILES:
+        try:
+            with open(abspath_from_root("data", name), "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            continue
+        for client in data.get("clients", []):
+            base = client.get("base_url", "").rstrip("/")
+            if base and base not in seen:
+                seen.add(base)
+                clients.append(client)
+    return clients
+
+
+class ProfileTemplate:
+    """
+    A Chrome user-data-dir whose HTTP cache already holds the app's JS/CSS/fonts.
+    Built once by visiting (and logging into) every tenant, then each session gets a
+    copy-on-write clone (reflink where the filesystem supports it, plain copy otherwise).
+    Once older than max_age the template is rebuilt in the background; clones keep
+    coming from the previous one until the new one is swapped in.
+    """
+
+    def __init__(self, name: str, launcher: Callable, max_age_h: Optional[float] = None,
+                 root: str = TEMPLATE_ROOT):
+        self.name = name
+        self.launcher = launcher  # launcher(user_data_dir=...) → driver
+        self.max_age = 3600 * (max_age_h if max_age_h is not None
+                               else float(os.environ.get(MAX_AGE_ENV, DEFAULT_MAX_AGE_H)))
+        self.dir = os.path.join(root, name)
+        self.stamp_path = os.path.join(root, f"{name}.json")
+        self.lock_path = os.path.join(root, f"{name}.lock")
+        self.debug_log = get_debug_file_logger()
+        self._lock = threading.Lock()
+        self._refreshing: Optional[threading.Thread] = None
+
+    # ---- public API ----
+    def clone(self) -> Optional[str]:
+        """Fresh user-data-dir for one session, or None if no template could be built."""
+        if not os.path.isdir(self.dir):
+            self.build()
+        elif self.age() > self.max_age:
+            self.refresh_async()
+        if not os.path.isdir(self.dir):
+            return None
+
+        target = tempfile.mkdtemp(prefix=f"ledger-chrome-{self.name}-")
+        try:
+            with self._lock:
+                _cow_copy(self.dir, target)
+            return target
+        except Exception as e:
+            self.debug_log.debug("ProfileTemplate: clone of %s failed (%s); using an empty profile", self.name, e)
+            shutil.rmtree(target, ignore_errors=True)
+            return None
+
+    def attach(self, drv, user_data_dir: str):
+        """Delete the clone once the driver object is gone (or at interpreter exit)."""
+        weakref.finalize(drv, shutil.rmtree, user_data_dir, True)
+
+    def age(self) -> float:
+        try:
+            with open(self.stamp_path, "r", encoding="utf-8") as f:
+                return time.time() - json.load(f)["built"]
+        except (OSError, ValueError, KeyError):
+            return float("inf")
+
+    def refresh_async(self):
+        if self._refreshing is not None and self._refreshing.is_alive():
+            return
+        self._refreshing = threading.Thread(target=self.build, name=f"profile-template-{self.name}", daemon=True)
+        self._refreshing.start()
+
+    def build(self) -> bool:
+        """Warm a new profile and swap it in. Only one process builds at a time."""
+        os.makedirs(os.path.dirname(self.dir), exist_ok=True)
+        if not self._take_build_lock():
+            self.debug_log.debug("ProfileTemplate: %s is being built elsewhere", self.name)
+            return False
+        staging = tempfile.mkdtemp(prefix=f".{self.name}-", dir=os.path.dirname(self.dir))
+        try:
+            t0 = time.monotonic()
+            warmed = self._warm(staging)
+            for skip in _SKIP:
+                _remove(os.path.join(staging, skip))
+            with self._lock:
+                old = self.dir + ".old"
+                shutil.rmtree(old, ignore_errors=True)
+                if os.path.isdir(self.dir):
+                    os.replace(self.dir, old)
+                os.replace(staging, self.dir)
+                shutil.rmtree(old, ignore_errors=True)
+            with open(self.stamp_path, "w", encoding="utf-8") as f:
+                json.dump({"built": time.time(), "pages": warmed}, f, indent=2)
+            self.debug_log.debug("ProfileTemplate: built %s (%s page(s)) in %.1fs",
+                                 self.name, len(warmed), time.monotonic() - t0)
+            return True
+        except Exception as e:
+            self.debug_log.debug("ProfileTemplate: build of %s failed (%s)", self.name, e)
+            shutil.rmtree(staging, ignore_errors=True)
+            return False
+        finally:
+            _remove(self.lock_path)
+
+    # ---- helpers ----
+    def _warm(self, user_data_dir: str) -> List[str]:
+        from pages.login_page import LoginPage
+        from pages.navbar_page import NavBar
+
+        warmed = []
+        drv = self.launcher(user_data_dir=user_data_dir)
+        try:
+            for client in warm_clients():
+                try:
+                    login = LoginPage(drv, client["base_url"])
+                    login.open_and_login(client["username"], client["password"], use_session_cache=False)
+                    NavBar(drv).open_data_search()
+                    login.wait_for_network_idle()
+                    warmed.append(client["base_url"])
+                except Exception as e:
+                    self.debug_log.debug("ProfileTemplate: warming %s stopped early (%s)", client.get("base_url"), e)
+                self._forget_auth(drv)
+            for url in filter(None, (u.strip() for u in os.environ.get(URLS_ENV, "").split(","))):
+                try:
+                    drv.get(url)
+                    warmed.append(url)
+                except Exception as e:
+                    self.debug_log.debug("ProfileTemplate: could not warm %s (%s)", url, e)
+        finally:
+            self._forget_auth(drv)
+            try:
+                drv.quit()  # flushes the disk cache
+            except Exception:
+                pass
+        return warmed
+
+    @staticmethod
+    def _forget_auth(drv):
+        try:
+            origin = drv.execute_script("return window.location.origin")
+            if origin and origin.startswith("http"):
+                drv.execute_cdp_cmd("Storage.clearDataForOrigin", {"origin": origin, "storageTypes": _CLEAR_STORAGE})
+            drv.execute_cdp_cmd("Network.clearBrowserCookies", {})
+        except Exception:
+            pass
+
+    def _take_build_lock(self) -> bool:
+        try:
+            if time.time() - os.path.getmtime(self.lock_path) > BUILD_LOCK_STALE:
+                _remove(self.lock_path)
+        except OSError:
+            pass
+        try:
+            os.close(os.open(self.lock_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL))
+            return True
+        except FileExistsError:
+            return False
+
+
+def _cow_copy(src: str, dst: str):
+    # GNU cp shares extents on btrfs/xfs/overlayfs with reflink support and silently copies elsewhere
+    if sys.platform.startswith("linux") and shutil.which("cp"):
+        subprocess.run(["cp", "-a", "--reflink=auto", os.path.join(src, "."), dst],
+                       check=True, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    else:
+        shutil.copytree(src, dst, dirs_exist_ok=True, ignore=shutil.ignore_patterns(*_SKIP))
+
+
+def _remove(path: str):
+    try:
+        if os.path.isdir(path) and not os.path.islink(path):
+            shutil.rmtree(path, ignore_errors=True)
+        else:
+            os.remove(path)
+    except OSError:
+        pass
+
+
+_templates = {}
+_templates_lock = threading.Lock()
+
+
+def profile_template(name: str, launcher: Callable) -> ProfileTemplate:
+    with _templates_lock:
+        if name not in _templates:
+            _templates[name] = ProfileTemplate(name, launcher)
+        return _templates[name]
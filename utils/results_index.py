@@ -0,0 +1,112 @@
+# utils/results_index.py
+import weakref
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from utils.tab_pool import per_tab
+
+# One pass over the rendered results: every <tr id=...> with its offset, handle and status badges.
+# Also (re)arms an observer that bumps window.__ledgerResultsGen whenever anything under a results
+# table changes, including tbodies inserted after the build.
+_BUILD_JS = """
+var sel = arguments[0] || 'table';
+if (!window.__ledgerResultsObs) {
+    // per-document id: a generation number from another tab or page load never matches
+    window.__ledgerResultsDoc = Date.now().toString(36) + Math.random().toString(36).slice(2);
+    window.__ledgerResultsGen = window.__ledgerResultsGen || 1;
+    window.__ledgerResultsObs = new MutationObserver(function () { window.__ledgerResultsGen++; });
+}
+var obs = window.__ledgerResultsObs, rows = {}, offset = 0;
+obs.disconnect();
+window.__ledgerResultsBodies = [];
+document.querySelectorAll(sel).forEach(function (table) {
+    obs.observe(table, {childList: true, subtree: true});
+    Array.prototype.forEach.call(table.tBodies, function (tbody) {
+        window.__ledgerResultsBodies.push(tbody);
+        Array.prototype.forEach.call(tbody.rows, function (tr) {
+            if (!tr.id) { return; }
+            var badges = Array.prototype.map.call(tr.querySelectorAll('span.label'), function (s) {
+                return (s.innerText || s.textContent || '').trim().toLowerCase();
+            }).filter(function (t) { return t; });
+            rows[tr.id] = {offset: offset++, el: tr, badges: badges};
+        });
+    });
+});
+return {gen: window.__ledgerResultsDoc + ':' + window.__ledgerResultsGen, rows: rows};
+"""
+
+# null once the observer is gone (navigation), a watched tbody was swapped out of the DOM, or the
+# index was built before any results tbody existed (nothing was being watched)
+_GEN_JS = """
+if (!window.__ledgerResultsObs) { return null; }
+var bodies = window.__ledgerResultsBodies || [];
+if (!bodies.length) { return null; }
+for (var i = 0; i < bodies.length; i++) { if (!bodies[i].isConnected) { return null; } }
+return window.__ledgerResultsDoc + ':' + window.__ledgerResultsGen;
+"""
+
+
+@dataclass
+class ResultRow:
+    ticket_id: str
+    offset: int
+    element: object  # WebElement of the <tr>
+    badges: List[str] = field(default_factory=list)
+
+    def has_status(self, status: str) -> bool:
+        return status.strip().lower() in self.badges
+
+
+class ResultsIndex:
+    """
+    ticket_id → ResultRow for the currently rendered Data → Search results,
+    built in one execute_script. valid() is False once the results table changes, and
+    always False for an index built before the results rendered.
+    """
+
+    def __init__(self, driver, table_css: str = "table"):
+        self.driver = driver
+        self.table_css = table_css
+        self.gen: Optional[str] = None
+        self.rows: Dict[str, ResultRow] = {}
+
+    def build(self) -> "ResultsIndex":
+        snap = self.driver.execute_script(_BUILD_JS, self.table_css) or {}
+        self.gen = snap.get("gen")
+        self.rows = {
+            tid: ResultRow(ticket_id=tid, offset=r["offset"], element=r["el"], badges=r.get("badges", []))
+            for tid, r in (snap.get("rows") or {}).items()
+        }
+        return self
+
+    def valid(self) -> bool:
+        if self.gen is None:
+            return False
+        try:
+            return self.driver.execute_script(_GEN_JS) == self.gen
+        except Exception:
+            return False
+
+    def get(self, ticket_id: str) -> Optional[ResultRow]:
+        return self.rows.get(ticket_id)
+
+    def __contains__(self, ticket_id: str) -> bool:
+        return ticket_id in self.rows
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+
+_indexes: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+
+def results_index_for(driver, table_css: str = "table") -> ResultsIndex:
+    """
+    The index of the driver's current tab, rebuilt only if the results redrew (or the
+    page changed) since the last build.
+    """
+    slot = per_tab(_indexes, driver, dict)
+    index = slot.get("index")
+    if index is None or index.table_css != table_css or not index.valid():
+        index = slot["index"] = ResultsIndex(driver, table_css).build()
+    return index
@@ -0,0 +1,195 @@
+# utils/session_cache.py
+import hashlib
+import json
+import os
+import tempfile
+import time
+from typing import Optional
+from urllib.parse import urlsplit
+
+from logger_utils import get_debug_file_logger
+from utils.paths import abspath_from_root
+
+try:  # optional: without it sessions are simply not cached
+    from cryptography.fernet import Fernet, InvalidToken
+except ImportError:
+    Fernet = None
+    InvalidToken = Exception
+
+SESSION_DIR = os.environ.get("LEDGER_SESSION_DIR", abspath_from_root(".cache", "sessions"))
+KEY_ENV = "LEDGER_SESSION_KEY"        # Fernet key; otherwise a 0600 key file next to the sessions
+ENABLED_ENV = "LEDGER_SESSION_CACHE"  # "0" disables the cache
+DEFAULT_TTL = 8 * 3600                # used when no session cookie carries an expiry
+
+_SNAPSHOT_STORAGE_JS = """
+function dump(s) { var o = {}; for (var i = 0; i < s.length; i++) { var k = s.key(i); o[k] = s.getItem(k); } return o; }
+return {local: dump(window.localStorage), session: dump(window.sessionStorage)};
+"""
+
+# Runs before any page script of the restored origin, so the app sees its storage on first load
+_HYDRATE_TEMPLATE = """
+(function () {
+    if (location.origin !== %(origin)s) { return; }
+    var data = %(data)s;
+    try { Object.keys(data.local).forEach(function (k) { if (localStorage.getItem(k) === null) { localStorage.setItem(k, data.local[k]); } }); } catch (e) {}
+    try { Object.keys(data.session).forEach(function (k) { if (sessionStorage.getItem(k) === null) { sessionStorage.setItem(k, data.session[k]); } }); } catch (e) {}
+})();
+"""
+
+
+class SessionCache:
+    """
+    Encrypted per-(base_url, username) snapshot of cookies + localStorage + sessionStorage
+    taken after a successful login, so new drivers can skip the login form.
+    """
+
+    def __init__(self, directory: str = SESSION_DIR):
+        self.directory = directory
+        self.debug_log = get_debug_file_logger()
+        self._fernet = None
+
+    @property
+    def enabled(self) -> bool:
+        return Fernet is not None and os.environ.get(ENABLED_ENV, "1") != "0"
+
+    # ---- public API ----
+    def save(self, driver, base_url: str, username: str):
+        if not self.enabled:
+            return
+        try:
+            storage = driver.execute_script(_SNAPSHOT_STORAGE_JS) or {"local": {}, "session": {}}
+            cookies = driver.get_cookies()
+            expiries = [c["expiry"] for c in cookies if c.get("expiry")]
+            snapshot = {
+                "app_url": driver.current_url,
+                "cookies": cookies,
+                "storage": storage,
+                "expires": min(expiries) if expiries else time.time() + DEFAULT_TTL,
+                "saved": time.time(),
+            }
+            os.makedirs(self.directory, exist_ok=True)
+            tmp = f"{self._path(base_url, username)}.{os.getpid()}.tmp"  # pool workers may save the same tenant
+            with open(tmp, "wb") as f:
+                f.write(self._cipher().encrypt(json.dumps(snapshot).encode("utf-8")))
+            os.replace(tmp, self._path(base_url, username))
+            self.debug_log.debug("SessionCache: saved session for %s @ %s", username, base_url)
+        except Exception as e:
+            self.debug_log.debug("SessionCache: save failed (%s)", e)
+
+    def restore(self, driver, base_url: str, username: str) -> bool:
+        """Hydrate driver from the snapshot and open the app URL. False if none/expired."""
+        snapshot = self._load(base_url, username)
+        if snapshot is None:
+            return False
+        if snapshot["expires"] <= time.time() + 60:
+            self.drop(base_url, username)
+            return False
+
+        origin = "{0.scheme}://{0.netloc}".format(urlsplit(snapshot["app_url"]))
+        try:
+            script_id = None
+            if hasattr(driver, "execute_cdp_cmd"):
+                script_id = self._restore_cdp(driver, origin, snapshot)
+            else:
+                self._restore_webdriver(driver, origin, snapshot)
+            driver.get(snapshot["app_url"])
+            if script_id:
+                # one-shot: a pooled driver must not re-hydrate this storage in the next test
+                driver.execute_cdp_cmd("Page.removeScriptToEvaluateOnNewDocument", {"identifier": script_id})
+            self.debug_log.debug("SessionCache: restored session for %s @ %s", username, base_url)
+            return True
+        except Exception as e:
+            self.debug_log.debug("SessionCache: restore failed (%s)", e)
+            return False
+
+    def drop(self, base_url: str, username: str):
+        try:
+            os.remove(self._path(base_url, username))
+        except OSError:
+            pass
+
+    # ---- helpers ----
+    def _restore_cdp(self, driver, origin: str, snapshot: dict) -> Optional[str]:
+        # cookies + storage without an extra page load; returns the hydrate script id
+        cookies = []
+        for c in snapshot["cookies"]:
+            cookie = {k: c[k] for k in ("name", "value", "domain", "path", "secure", "httpOnly") if k in c}
+            if c.get("expiry"):
+                cookie["expires"] = c["expiry"]
+            if c.get("sameSite"):
+                cookie["sameSite"] = c["sameSite"]
+            cookies.append(cookie)
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setCookies", {"cookies": cookies})
+        source = _HYDRATE_TEMPLATE % {"origin": json.dumps(origin), "data": json.dumps(snapshot["storage"])}
+        return driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": source}).get("identifier")
+
+    def _restore_webdriver(self, driver, origin: str, snapshot: dict):
+        driver.get(origin + "/")
+        for c in snapshot["cookies"]:
+            c = {k: v for k, v in c.items() if k != "sameSite" or v in ("Strict", "Lax", "None")}
+            driver.add_cookie(c)
+        driver.execute_script(
+            "var d = arguments[0];"
+            "Object.keys(d.local).forEach(function (k) { localStorage.setItem(k, d.local[k]); });"
+            "Object.keys(d.session).forEach(function (k) { sessionStorage.setItem(k, d.session[k]); });",
+            snapshot["storage"],
+        )
+
+    def _load(self, base_url: str, username: str) -> Optional[dict]:
+        if not self.enabled:
+            return None
+        try:
+            with open(self._path(base_url, username), "rb") as f:
+                return json.loads(self._cipher().decrypt(f.read()).decode("utf-8"))
+        except FileNotFoundError:
+            return None
+        except (InvalidToken, ValueError) as e:
+            self.debug_log.debug("SessionCache: unreadable snapshot (%s); dropping", e)
+            self.drop(base_url, username)
+            return None
+
+    def _path(self, base_url: str, username: str) -> str:
+        digest = hashlib.sha256(f"{base_url.rstrip('/')}|{username}".encode("utf-8")).hexdigest()[:32]
+        return os.path.join(self.directory, f"{digest}.session")
+
+    def _cipher(self):
+        if self._fernet is None:
+            key = os.environ.get(KEY_ENV)
+            if not key:
+                key = _read_or_create_key(os.path.join(self.directory, "session.key"))
+            self._fernet = Fernet(key)
+        return self._fernet
+
+
+def _read_or_create_key(key_path: str) -> bytes:
+    """
+    The shared key file, created on first use. The key is written to a temp file and
+    hard-linked into place, so concurrent pool workers either win the link or read the
+    winner's complete key; nobody sees a partial file.
+    """
+    if not os.path.exists(key_path):
+        directory = os.path.dirname(key_path)
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(prefix=".session.key.", dir=directory)  # 0600
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(Fernet.generate_key())
+            try:
+                os.link(tmp, key_path)
+            except FileExistsError:
+                pass  # another worker created it first; use theirs
+        finally:
+            os.remove(tmp)
+    with open(key_path, "rb") as f:
+        return f.read().strip()
+
+
+_cache = None
+
+
+def get_session_cache() -> SessionCache:
+    global _cache
+    if _cache is None:
+        _cache = SessionCache()
+    return _cache
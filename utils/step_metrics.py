@@ -0,0 +1,97 @@
+# utils/step_metrics.py
+import json
+import math
+import os
+import threading
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+Key = Tuple[str, str, str]  # (step, tenant, outcome)
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100.0 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+class StepMetrics:
+    """
+    In-process registry of log_step durations keyed by (step name, tenant, outcome).
+    report() aggregates count / p50 / p95 / p99 / max per key.
+    """
+
+    def __init__(self):
+        self._samples: Dict[Key, List[float]] = defaultdict(list)
+        self._lock = threading.Lock()
+
+    def record(self, step: str, tenant: str, outcome: str, seconds: float):
+        with self._lock:
+            self._samples[(step, tenant or "", outcome)].append(seconds)
+
+    def merge(self, rows: Iterable[dict]):
+        """Add samples exported by another process (see export())."""
+        with self._lock:
+            for row in rows:
+                self._samples[(row["step"], row["tenant"], row["outcome"])].extend(row["samples"])
+
+    def export(self, clear: bool = False) -> List[dict]:
+        """Raw samples as JSON-friendly rows, e.g. to ship from a pool worker to the parent."""
+        with self._lock:
+            rows = [{"step": s, "tenant": t, "outcome": o, "samples": list(v)}
+                    for (s, t, o), v in self._samples.items()]
+            if clear:
+                self._samples.clear()
+        return rows
+
+    def __len__(self) -> int:
+        with self._lock:
+            return sum(len(v) for v in self._samples.values())
+
+    # ---- reporting ----
+    def report(self) -> List[dict]:
+        """One row per key, slowest p95 first."""
+        rows = []
+        for row in self.export():
+            values = sorted(row.pop("samples"))
+            row.update({
+                "count": len(values),
+                "p50": round(percentile(values, 50), 3),
+                "p95": round(percentile(values, 95), 3),
+                "p99": round(percentile(values, 99), 3),
+                "max": round(values[-1], 3),
+                "total": round(sum(values), 3),
+            })
+            rows.append(row)
+        rows.sort(key=lambda r: (r["p95"], r["total"]), reverse=True)
+        return rows
+
+    def table(self, rows: Optional[List[dict]] = None) -> str:
+        rows = self.report() if rows is None else rows
+        header = ("Step", "Tenant", "Outcome", "Count", "p50 s", "p95 s", "p99 s", "Max s")
+        lines = [(r["step"], r["tenant"] or "-", r["outcome"], str(r["count"]),
+                  f"{r['p50']:.3f}", f"{r['p95']:.3f}", f"{r['p99']:.3f}", f"{r['max']:.3f}") for r in rows]
+        widths = [max(len(col[i]) for col in [header] + lines) for i in range(len(header))]
+        fmt = "  ".join(f"{{:<{w}}}" if i < 3 else f"{{:>{w}}}" for i, w in enumerate(widths))
+        out = [fmt.format(*header), "  ".join("-" * w for w in widths)]
+        out.extend(fmt.format(*line) for line in lines)
+        return "\n".join(out)
+
+    def write_report(self, path: str) -> List[dict]:
+        """JSON report to `path`, table next to it (.txt). Returns the rows."""
+        rows = self.report()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(rows, f, indent=2)
+        with open(os.path.splitext(path)[0] + ".txt", "w", encoding="utf-8") as f:
+            f.write(self.table(rows) + "\n")
+        return rows
+
+
+_metrics = StepMetrics()
+
+
+def get_step_metrics() -> StepMetrics:
+    return _metrics
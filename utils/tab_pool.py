@@ -0,0 +1,173 @@
+# utils/tab_pool.py
+import queue
+import threading
+import time
+import weakref
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from selenium.webdriver.remote.command import Command
+
+from logger_utils import get_debug_file_logger
+
+_FRAME_COMMANDS = (Command.SWITCH_TO_FRAME, Command.SWITCH_TO_PARENT_FRAME)
+_POOL_ATTR = "_ledger_tab_pool"
+
+
+def current_tab(driver) -> Optional[str]:
+    """Window handle owned by the calling TabPool thread; None outside a TabPool (no WebDriver call)."""
+    pool = getattr(driver, "__dict__", {}).get(_POOL_ATTR)
+    if pool is None:
+        return None
+    return getattr(pool._local, "handle", None)
+
+
+def per_tab(cache: "weakref.WeakKeyDictionary", driver, factory: Callable):
+    """
+    Per-driver cache entry that is also per TabPool tab, so page state (results index,
+    frame map, ...) built in one tab is never trusted in another.
+    """
+    tabs: Optional[Dict] = cache.get(driver)
+    if tabs is None:
+        tabs = cache[driver] = {}
+    key = current_tab(driver)
+    state = tabs.get(key)
+    if state is None:
+        state = tabs[key] = factory()
+    return state
+
+
+class TabPool:
+    """
+    Runs K flows concurrently in K tabs of ONE (already logged-in) browser.
+
+    Every WebDriver command, including element commands issued from page objects,
+    goes through driver.execute. The pool wraps it so that each thread holds a shared
+    lock only for the duration of a single command, first switching to its own tab
+    (and re-entering its frames). Waits (WebDriverWait polling, sleeps) happen outside
+    the lock, so while one tab waits on a modal or a table redraw another tab issues
+    commands. Page objects need no changes. driver.get() holds the lock until the page
+    loads, so pair this with the "eager" page-load strategy (throughput profile).
+    """
+
+    def __init__(self, driver, tabs: int = 3, start_url: Optional[str] = None):
+        self.driver = driver
+        self.tabs = max(1, int(tabs))
+        self.start_url = start_url
+        self.debug_log = get_debug_file_logger()
+        self._lock = threading.RLock()
+        self._local = threading.local()
+        self._active: Optional[str] = None
+        self._raw_execute = None
+        self.handles: List[str] = []
+
+    # ---- command routing ----
+    def _install(self):
+        self._raw_execute = self.driver.execute
+        self._active = self.driver.current_window_handle
+        self.driver.execute = self._execute
+        setattr(self.driver, _POOL_ATTR, self)
+
+    def _uninstall(self):
+        if self._raw_execute is not None:
+            del self.driver.execute  # back to the class method
+            self.driver.__dict__.pop(_POOL_ATTR, None)
+            self._raw_execute = None
+
+    def _execute(self, command, params=None):
+        handle = getattr(self._local, "handle", None)
+        with self._lock:
+            if handle is None:  # not a pool thread: plain pass-through
+                return self._raw_execute(command, params)
+            if self._active != handle:
+                self._raw_execute(Command.SWITCH_TO_WINDOW, {"handle": handle})
+                for frame_params in self._local.frames:
+                    self._raw_execute(Command.SWITCH_TO_FRAME, frame_params)
+                self._active = handle
+
+            result = self._raw_execute(command, params)
+
+            # keep this thread's browsing context in sync with what it asked for
+            if command == Command.SWITCH_TO_WINDOW:
+                self._local.handle = self._active = (params or {}).get("handle", handle)
+                self._local.frames = []
+            elif command == Command.SWITCH_TO_FRAME:
+                if (params or {}).get("id") is None:
+                    self._local.frames = []  # default_content()
+                else:
+                    self._local.frames.append(params)
+            elif command == Command.SWITCH_TO_PARENT_FRAME and self._local.frames:
+                self._local.frames.pop()
+            elif command == Command.CLOSE:
+                self._active = None
+            return result
+
+    # ---- tabs ----
+    def _open_tabs(self):
+        first = self.driver.current_window_handle
+        self.handles = [first]
+        for _ in range(self.tabs - 1):
+            self.driver.switch_to.new_window("tab")
+            self.handles.append(self.driver.current_window_handle)
+            if self.start_url:
+                self.driver.get(self.start_url)
+        self.driver.switch_to.window(first)
+        if self.start_url:
+            self.driver.get(self.start_url)
+
+    def _close_tabs(self):
+        for handle in self.handles[1:]:
+            try:
+                self.driver.switch_to.window(handle)
+                self.driver.close()
+            except Exception:
+                pass
+        if self.handles:
+            try:
+                self.driver.switch_to.window(self.handles[0])
+            except Exception:
+                pass
+
+    # ---- public API ----
+    def run(self, flow: Callable, items: Iterable,
+            on_result: Optional[Callable[[Tuple], None]] = None) -> List[Tuple]:
+        """
+        Call flow(driver, item) for every item, spread over the tabs.
+        Returns [(item, ok, result_or_exception, seconds), ...] in completion order.
+        """
+        work: "queue.Queue" = queue.Queue()
+        for item in items:
+            work.put(item)
+        results: List[Tuple] = []
+        results_lock = threading.Lock()
+
+        def worker(handle: str):
+            self._local.handle, self._local.frames = handle, []
+            while True:
+                try:
+                    item = work.get_nowait()
+                except queue.Empty:
+                    return
+                t0 = time.monotonic()
+                try:
+                    out = (item, True, flow(self.driver, item), time.monotonic() - t0)
+                except Exception as e:
+                    self.debug_log.debug("TabPool: item %r failed in tab %s (%s)", item, handle, e)
+                    out = (item, False, e, time.monotonic() - t0)
+                with results_lock:
+                    results.append(out)
+                if on_result:
+                    on_result(out)
+
+        self._open_tabs()
+        self._install()
+        try:
+            threads = [threading.Thread(target=worker, args=(h,), name=f"tab-{i}", daemon=True)
+                       for i, h in enumerate(self.handles)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+        finally:
+            self._uninstall()
+            self._close_tabs()
+        return results
@@ -0,0 +1,81 @@
+# utils/table_extract.py
+import re
+from decimal import Decimal, InvalidOperation
+from typing import Dict, List, Optional
+
+# Every visible <table> (or only those matching arguments[0]) as
+# {index, id, headers: [...], rows: [{id, cells: [...]}]} — one round trip for the whole page.
+# arguments[1] skips that many visible body rows per table (only later rows are read and sent).
+_TABLES_JS = """
+var sel = arguments[0] || 'table', skip = arguments[1] || 0;
+function visible(el) { return el.getClientRects().length > 0; }
+function text(el) { return (el.innerText || el.textContent || '').replace(/\\s+/g, ' ').trim(); }
+var out = [];
+document.querySelectorAll(sel).forEach(function (table, ti) {
+    if (!visible(table)) { return; }
+    var headRow = table.querySelector('thead tr') || table.querySelector('tr');
+    var headers = headRow ? Array.prototype.map.call(headRow.querySelectorAll('th'), text) : [];
+    var bodyRows = table.tBodies.length
+        ? Array.prototype.concat.apply([], Array.prototype.map.call(table.tBodies, function (b) { return Array.prototype.slice.call(b.rows); }))
+        : Array.prototype.slice.call(table.rows, 1);
+    var rows = [], n = 0;
+    bodyRows.forEach(function (tr) {
+        if (!visible(tr) || tr.querySelector('td.dataTables_empty')) { return; }
+        if (n++ < skip) { return; }
+        rows.push({id: tr.id || '', cells: Array.prototype.map.call(tr.cells, text)});
+    });
+    out.push({index: ti, id: table.id || '', headers: headers, rows: rows});
+});
+return out;
+"""
+
+
+def read_tables(driver, css: str = "", skip_rows: int = 0) -> List[dict]:
+    return driver.execute_script(_TABLES_JS, css, skip_rows) or []
+
+
+def _norm(header: str) -> str:
+    return re.sub(r"[^a-z0-9#]+", " ", (header or "").lower()).strip()
+
+
+def map_columns(headers: List[str], aliases: Dict[str, List[str]]) -> Dict[str, int]:
+    """field → column index. Exact header matches win over 'contains' matches; each column used once."""
+    normed = [_norm(h) for h in headers]
+    mapping: Dict[str, int] = {}
+    for exact in (True, False):
+        for field, names in aliases.items():
+            if field in mapping:
+                continue
+            for name in names:
+                hits = [i for i, h in enumerate(normed)
+                        if i not in mapping.values() and (h == name if exact else name in h)]
+                if hits:
+                    mapping[field] = hits[0]
+                    break
+    return mapping
+
+
+def pick_table(tables: List[dict], aliases: Dict[str, List[str]], required: List[str]):
+    """The table whose headers map the most fields (all `required` ones must map). (table, mapping) or (None, {})."""
+    best, best_map = None, {}
+    for table in tables:
+        mapping = map_columns(table["headers"], aliases)
+        if all(f in mapping for f in required) and len(mapping) > len(best_map):
+            best, best_map = table, mapping
+    return best, best_map
+
+
+def parse_money(text: str) -> Optional[Decimal]:
+    """'$1,234.50' → 1234.50, '-$6' / '($6.00)' → -6; blank or unparsable → None."""
+    if not text:
+        return None
+    raw = text.strip()
+    negative = raw.startswith("-") or (raw.startswith("(") and raw.endswith(")"))
+    digits = re.sub(r"[^0-9.]", "", raw)
+    if not digits:
+        return None
+    try:
+        value = Decimal(digits)
+    except InvalidOperation:
+        return None
+    return -value if negative else value
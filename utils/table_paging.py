@@ -0,0 +1,150 @@
+# utils/table_paging.py
+from dataclasses import dataclass, field
+from typing import Callable, Iterator, List, Optional
+
+from selenium.common.exceptions import TimeoutException
+
+from utils.table_extract import read_tables
+from utils.waits import PollingWait
+
+# Identity of what the table shows right now: first body row's id + text ('' when empty, null while
+# a full-width "Loading…"/"Processing…" placeholder row is shown). The page number alone is no
+# evidence: server-side DataTables bump it before the data arrives.
+_FIRST_ROW_FN = """
+function firstRow(table) {
+    var body = table && table.tBodies[0], tr = body && body.rows[0];
+    if (!tr) { return ''; }
+    if (tr.cells.length === 1 && (tr.cells[0].colSpan > 1 || tr.cells[0].classList.contains('dataTables_empty'))) {
+        return null;
+    }
+    return (tr.id || '') + '|' + (tr.innerText || tr.textContent || '').trim().slice(0, 200);
+}
+"""
+
+_PAGE_STATE_JS = _FIRST_ROW_FN + """
+return firstRow(document.querySelectorAll(arguments[0] || 'table')[arguments[1]]);
+"""
+
+# Move table #arguments[1] of querySelectorAll(arguments[0]) to its next page.
+# DataTables API first, then a generic "Next" pager button. Returns false on the last page,
+# else {before: firstRow()} as it was before the turn.
+_NEXT_PAGE_JS = _FIRST_ROW_FN + """
+var table = document.querySelectorAll(arguments[0] || 'table')[arguments[1]];
+if (!table) { return false; }
+var before = firstRow(table);
+if (window.jQuery && jQuery.fn.dataTable && jQuery.fn.dataTable.isDataTable(table)) {
+    var api = jQuery(table).DataTable(), info = api.page.info();
+    if (info.pages === 0 || info.page >= info.pages - 1) { return false; }
+    api.page('next').draw('page');
+    return {before: before};
+}
+var scope = table.closest('.dataTables_wrapper') || table.parentElement || document;
+var next = scope.querySelector('.paginate_button.next, li.next > a, a.next, [aria-label="Next"]');
+if (!next) { return false; }
+var li = next.closest('li');
+if (next.classList.contains('disabled') || (li && li.classList.contains('disabled'))
+        || next.getAttribute('aria-disabled') === 'true') { return false; }
+next.click();
+return {before: before};
+"""
+
+# Infinite scroll: push the table's scroll container (or the window) to the bottom.
+_SCROLL_JS = """
+var table = document.querySelectorAll(arguments[0] || 'table')[arguments[1]];
+var box = table && (table.closest('.dataTables_scrollBody') || table.parentElement);
+if (box && box.scrollHeight > box.clientHeight) { box.scrollTop = box.scrollHeight; }
+else { window.scrollTo(0, document.body.scrollHeight); }
+return true;
+"""
+
+
+@dataclass
+class TableRow:
+    """A row snapshot: tr id (if any), cell texts, and the table's header texts."""
+    row_id: str
+    cells: List[str]
+    headers: List[str] = field(default_factory=list)
+    page_no: int = 0
+
+    def get(self, header: str, default: str = "") -> str:
+        wanted = header.strip().lower()
+        for i, h in enumerate(self.headers):
+            if h.strip().lower() == wanted and i < len(self.cells):
+                return self.cells[i]
+        return default
+
+
+def iter_table_rows(page, table_css: str = "table", mode: str = "pages", prefetch: bool = True,
+                    until: Optional[Callable[[TableRow], bool]] = None,
+                    choose: Optional[Callable[[List[dict]], Optional[dict]]] = None,
+                    max_pages: int = 10_000, settle_timeout: float = 20) -> Iterator[TableRow]:
+    """
+    Lazily yield rows of a paginated (mode="pages") or infinite-scroll (mode="scroll") table,
+    one page at a time; only the current page is held in memory.
+
+    prefetch: the next page is requested BEFORE the current page's rows are handed out,
+              so the browser loads it while the caller works. Rows are data snapshots;
+              callers that must click inside the yielded page should pass prefetch=False.
+    until:    early exit — iteration stops right after the first row for which it is True.
+    choose:   picks the table out of read_tables() results (default: first with rows).
+    `page` is any BasePage (its DOM-settled wait detects each redraw). In "pages" mode a
+    turn only counts once the first row changed; a page that never arrives raises
+    TimeoutException rather than yielding the previous page again.
+    """
+    driver = page.driver
+    choose = choose or (lambda tables: next((t for t in tables if t["rows"]), tables[0] if tables else None))
+    turn_js = _SCROLL_JS if mode == "scroll" else _NEXT_PAGE_JS
+
+    table = choose(read_tables(driver, table_css))
+    if table is None:
+        return
+    index, seen = table["index"], 0
+    # own watch key: waits the caller runs between rows must not remove the prefetch watch
+    watch_key = f"table_paging:{table_css}:{index}"
+
+    try:
+        for page_no in range(max_pages):
+            rows = table["rows"]
+            headers = table["headers"]
+
+            turned = False
+            if prefetch:
+                page.start_dom_watch(key=watch_key)
+                turned = driver.execute_script(turn_js, table_css, index)
+
+            for row in rows:
+                item = TableRow(row_id=row["id"], cells=row["cells"], headers=headers, page_no=page_no)
+                yield item
+                if until is not None and until(item):
+                    return
+
+            if not prefetch:
+                page.start_dom_watch(key=watch_key)
+                turned = driver.execute_script(turn_js, table_css, index)
+            if not turned:
+                return
+            if mode != "scroll":
+                _wait_for_new_page(driver, table_css, index, turned.get("before"), page_no, settle_timeout)
+            if not page.wait_for_dom_settled(quiet_ms=250, timeout=settle_timeout, require_change=True,
+                                             key=watch_key):
+                return  # nothing new arrived (last page / end of scroll)
+
+            if mode == "scroll":
+                seen += len(rows)  # only rows past this offset are read and transferred
+            tables = read_tables(driver, table_css, skip_rows=seen)
+            table = next((t for t in tables if t["index"] == index), None)
+            if table is None or (mode == "scroll" and not table["rows"]):
+                return
+    finally:
+        page.stop_dom_watch(key=watch_key)
+
+
+def _wait_for_new_page(driver, table_css: str, index: int, before: str, page_no: int, timeout: float):
+    """Until the table shows a real first row other than `before` (a "Processing…" redraw does not count)."""
+    try:
+        PollingWait(driver, timeout, poll_frequency=0.1).until(
+            lambda d: d.execute_script(_PAGE_STATE_JS, table_css, index) not in (None, before))
+    except TimeoutException as e:
+        raise TimeoutException(
+            f"Table {table_css}[{index}] still shows page {page_no + 1} after turning the page; "
+            f"not re-reading it as page {page_no + 2}") from e
@@ -0,0 +1,165 @@
+# utils/tracing.py
+import contextvars
+import functools
+import json
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional
+
+from utils.command_audit import get_command_audit
+
+TRACE_ENV = "LEDGER_TRACE"   # "1" → record spans from process start (pytest: --trace-spans)
+MAX_EVENTS = 500_000         # recording stops (and says so in the export) past this many spans
+
+_stack: contextvars.ContextVar = contextvars.ContextVar("ledger_span_stack", default=())
+
+
+class Tracer:
+    """
+    Nested spans (log_step → BasePage helper → WebDriver command) kept in memory and
+    exported as Chrome trace-event JSON (open in ui.perfetto.dev or chrome://tracing).
+    Nesting follows the call stack per thread, so TabPool / async worker threads get
+    their own tracks. Disabled, span() costs one attribute check.
+    """
+
+    def __init__(self):
+        self.enabled = os.environ.get(TRACE_ENV, "0") == "1"
+        self.dropped = 0
+        self._events: List[dict] = []
+        self._threads: Dict[int, str] = {}
+        self._lock = threading.Lock()
+        self._origin_ns = time.perf_counter_ns()
+
+    # ---- control ----
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def clear(self):
+        with self._lock:
+            self._events, self._threads, self.dropped = [], {}, 0
+
+    # ---- recording ----
+    @contextmanager
+    def span(self, name: str, cat: str = "helper", **attrs):
+        if not self.enabled:
+            yield None
+            return
+        parent = _stack.get()
+        token = _stack.set(parent + (name,))
+        start = time.perf_counter_ns()
+        error = None
+        try:
+            yield attrs  # callers may add attributes while the span is open
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            end = time.perf_counter_ns()
+            _stack.reset(token)
+            if error is not None:
+                attrs["error"] = f"{type(error).__name__}: {error}"[:200]
+            self._add(name, cat, start, end, attrs, depth=len(parent))
+
+    def current(self) -> Optional[str]:
+        """Name of the innermost open span of this thread / task."""
+        stack = _stack.get()
+        return stack[-1] if stack else None
+
+    def _add(self, name: str, cat: str, start_ns: int, end_ns: int, attrs: dict, depth: int):
+        thread = threading.current_thread()
+        event = {
+            "name": name, "cat": cat, "ph": "X", "pid": os.getpid(), "tid": thread.ident,
+            "ts": (start_ns - self._origin_ns) / 1000.0, "dur": (end_ns - start_ns) / 1000.0,
+            "args": {k: _jsonable(v) for k, v in attrs.items()},
+        }
+        event["args"]["depth"] = depth
+        with self._lock:
+            if len(self._events) >= MAX_EVENTS:
+                self.dropped += 1
+                return
+            self._events.append(event)
+            self._threads.setdefault(thread.ident, thread.name)
+
+    # ---- export ----
+    def export(self, path: str, clear: bool = False) -> int:
+        """Write Chrome trace-event JSON. Returns the number of spans written."""
+        with self._lock:
+            events = list(self._events)
+            threads = dict(self._threads)
+            dropped = self.dropped
+            if clear:
+                self._events, self._threads, self.dropped = [], {}, 0
+        meta = [{"name": "thread_name", "ph": "M", "pid": os.getpid(), "tid": tid, "args": {"name": name}}
+                for tid, name in threads.items()]
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": meta + events, "displayTimeUnit": "ms",
+                       "otherData": {"dropped_spans": dropped}}, f)
+        return len(events)
+
+
+def _jsonable(value):
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    return repr(value)[:200]
+
+
+_tracer = Tracer()
+
+
+def get_tracer() -> Tracer:
+    return _tracer
+
+
+def traced(cat: str = "helper") -> Callable:
+    """Span around a page-object method, named <Class>.<method>."""
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            if not _tracer.enabled:
+                return func(self, *args, **kwargs)
+            with _tracer.span(f"{type(self).__name__}.{func.__name__}", cat):
+                return func(self, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def instrument_driver(drv):
+    """
+    Wrap the driver's RemoteConnection so every WebDriver command (including element
+    commands and those routed through TabPool) is a span under the current helper/step
+    and is counted against the active log_step (utils.command_audit).
+    """
+    executor = drv.command_executor
+    if getattr(executor, "_ledger_instrumented", False):
+        return drv
+    raw_execute = executor.execute
+    audit = get_command_audit()
+
+    def execute(command, params):
+        t0 = time.perf_counter()
+        try:
+            if not _tracer.enabled:
+                return raw_execute(command, params)
+            attrs = {}
+            if params and "using" in params:
+                attrs["locator"] = f"{params['using']}={params.get('value')}"
+            with _tracer.span(command, "webdriver", **attrs):
+                return raw_execute(command, params)
+        finally:
+            audit.record(command, params, time.perf_counter() - t0)
+
+    executor.execute = execute
+    executor._ledger_instrumented = True
+    return drv
+
+
+def trace_file_name(nodeid: str) -> str:
+    """Filesystem-safe name for a pytest node id."""
+    return re.sub(r"[^A-Za-z0-9_.-]+", "_", nodeid).strip("_") + ".trace.json"
@@ -2,10 +2,24 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.by import By
 
+from utils.command_audit import polling
+
 DEFAULT_WAIT = 20
 
+
+class PollingWait(WebDriverWait):
+    """WebDriverWait whose polls are not reported as repeated commands by utils.command_audit."""
+
+    def until(self, method, message: str = ""):
+        with polling():
+            return super().until(method, message)
+
+    def until_not(self, method, message: str = ""):
+        with polling():
+            return super().until_not(method, message)
+
 def wait_for_presence(driver, by: By, locator: str, timeout: int = DEFAULT_WAIT):
-    return WebDriverWait(driver, timeout).until(EC.presence_of_element_located((by, locator)))
+    return PollingWait(driver, timeout).until(EC.presence_of_element_located((by, locator)))
 
 def wait_for_clickable(driver, by: By, locator: str, timeout: int = DEFAULT_WAIT):
-    return WebDriverWait(driver, timeout).until(EC.element_to_be_clickable((by, locator)))
+    return PollingWait(driver, timeout).until(EC.element_to_be_clickable((by, locator)))
@@ -0,0 +1,145 @@
+# utils/warm_spawner.py
+import queue
+import threading
+import time
+from typing import Callable, List, Optional
+
+from logger_utils import get_debug_file_logger
+
+
+class WarmSpawner:
+    """
+    Keeps `target` pre-launched browser sessions idle in a queue. A background thread
+    launches (and optionally prepares, e.g. logs in) sessions whenever the queue runs
+    below target, so take() only blocks when every warm session has been handed out.
+    Use take as a DriverPool factory to hide Chrome launch latency behind running tests.
+    """
+
+    def __init__(self, factory: Callable, target: int = 1, prepare: Optional[Callable] = None,
+                 retry_delay: float = 5.0):
+        self.factory = factory
+        self.target = max(0, int(target))
+        self.prepare = prepare
+        self.retry_delay = retry_delay
+        self.debug_log = get_debug_file_logger()
+        self._ready: "queue.Queue" = queue.Queue()
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        # metrics
+        self.launched = 0
+        self.launch_failures = 0
+        self.launch_seconds: List[float] = []
+        self.wait_seconds: List[float] = []
+        self.hits = 0
+        self.misses = 0
+
+    # ---- lifecycle ----
+    def start(self):
+        if self.target and self._thread is None:
+            self._thread = threading.Thread(target=self._refill_loop, name="warm-spawner", daemon=True)
+            self._thread.start()
+        return self
+
+    def close(self):
+        """Stop refilling and quit every session still waiting in the queue."""
+        self._stopped.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=120)
+        while True:
+            try:
+                drv = self._ready.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                drv.quit()
+            except Exception:
+                pass
+
+    # ---- public API ----
+    @property
+    def depth(self) -> int:
+        return self._ready.qsize()
+
+    def take(self, timeout: float = 300):
+        """A warm session; launches inline only if spawning is disabled."""
+        if not self.target:
+            return self._launch()
+        t0 = time.monotonic()
+        try:
+            drv = self._ready.get_nowait()
+            hit = True
+        except queue.Empty:
+            self._wake.set()
+            drv = self._ready.get(timeout=timeout)
+            hit = False
+        waited = time.monotonic() - t0
+        with self._lock:
+            self.wait_seconds.append(waited)
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+        self.debug_log.debug("WarmSpawner: handed out session %s (waited %.2fs, %s left)",
+                             id(drv), waited, self.depth)
+        self._wake.set()
+        return drv
+
+    def stats(self) -> dict:
+        with self._lock:
+            waits = sorted(self.wait_seconds)
+            launches = list(self.launch_seconds)
+        return {
+            "target": self.target,
+            "depth": self.depth,
+            "launched": self.launched,
+            "launch_failures": self.launch_failures,
+            "hits": self.hits,
+            "misses": self.misses,
+            "avg_launch_s": round(sum(launches) / len(launches), 2) if launches else 0.0,
+            "avg_wait_s": round(sum(waits) / len(waits), 3) if waits else 0.0,
+            "max_wait_s": round(waits[-1], 3) if waits else 0.0,
+        }
+
+    # ---- background refill ----
+    def _refill_loop(self):
+        while not self._stopped.is_set():
+            if self.depth >= self.target:
+                self._wake.wait(timeout=1.0)
+                self._wake.clear()
+                continue
+            try:
+                drv = self._launch()
+            except Exception as e:
+                self.launch_failures += 1
+                self.debug_log.debug("WarmSpawner: launch failed (%s); retrying in %ss", e, self.retry_delay)
+                self._stopped.wait(self.retry_delay)
+                continue
+            if self._stopped.is_set():
+                try:
+                    drv.quit()
+                except Exception:
+                    pass
+                break
+            self._ready.put(drv)
+
+    def _launch(self):
+        t0 = time.monotonic()
+        drv = self.factory()
+        if self.prepare is not None:
+            try:
+                self.prepare(drv)
+            except Exception:
+                try:
+                    drv.quit()
+                except Exception:
+                    pass
+                raise
+        elapsed = time.monotonic() - t0
+        with self._lock:
+            self.launched += 1
+            self.launch_seconds.append(elapsed)
+        self.debug_log.debug("WarmSpawner: session %s ready in %.1fs", id(drv), elapsed)
+        return drv